@@ -315,7 +315,7 @@ class APITester:
             import openai
         except ImportError:
             raise APITestError(
-                "OpenAI SDK not installed. Install with: pip install openai"
+                "OpenAI SDK not installed. Install with: pip install 'promptv[providers]'"
             )
         
         client = openai.OpenAI(api_key=api_key, base_url=api_base_url)
@@ -369,7 +369,7 @@ class APITester:
             import anthropic
         except ImportError:
             raise APITestError(
-                "Anthropic SDK not installed. Install with: pip install anthropic"
+                "Anthropic SDK not installed. Install with: pip install 'promptv[providers]'"
             )
         
         client = anthropic.Anthropic(api_key=api_key, base_url=api_base_url)
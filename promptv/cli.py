@@ -13,6 +13,7 @@ from .secrets_manager import (
     SecretsManagerError
 )
 from .config_manager import ConfigManager
+from .paths import BASE_DIR_ENV_VAR, base_dir_override, get_base_dir
 from .exceptions import (
     PromptNotFoundError,
     TagNotFoundError,
@@ -36,17 +37,26 @@ from .interactive_tester import InteractiveTester
 
 @click.group()
 @click.version_option(version='0.1.7')
+@click.option('--base-dir', type=click.Path(file_okay=False, resolve_path=True, path_type=Path),
+              help=f'Use this directory instead of ~/.promptv (or ${BASE_DIR_ENV_VAR})')
 @click.pass_context
-def cli(ctx):
+def cli(ctx, base_dir):
     """
     promptv - A CLI tool for managing prompts locally with versioning.
     
     On first run, creates ~/.promptv/.config and ~/.promptv/prompts directories.
     All prompts are saved in Markdown (.md) format.
     """
+    ctx.ensure_object(dict)
+    ctx.obj['base_dir'] = base_dir
+    if base_dir is not None:
+        # Every manager resolves its paths through get_base_dir(); point it at
+        # the override until this command's context closes
+        ctx.with_resource(base_dir_override(base_dir))
+    
     # Auto-initialize on first run (skip for 'init' command)
     if ctx.invoked_subcommand != 'init':
-        base_dir = Path.home() / ".promptv"
+        base_dir = get_base_dir()
         if not base_dir.exists():
             try:
                 # Silent initialization
@@ -321,12 +331,13 @@ def prompt_get(name, version, label, var, project):
         if var:
             var_engine = VariableEngine()
             
-            # Validate and render
-            is_valid, missing = var_engine.validate_variables(content, var)
+            # Validate and render from a single parse
+            required, template = var_engine.prepare(content)
+            is_valid, missing = var_engine.validate_variables_against(required, var)
             if not is_valid:
                 raise VariableMissingError(missing)
             
-            content = var_engine.render(content, var)
+            content = template.render(**var)
         
         click.echo(content)
     except PromptNotFoundError as e:
@@ -369,7 +380,6 @@ def prompt_list(name, show_tags, show_variables, project):
     """
     try:
         manager = PromptManager()
-        tag_manager = TagManager(manager.prompts_dir)
         
         if name:
             prompt_project = project if project else 'default'
@@ -384,7 +394,7 @@ def prompt_list(name, show_tags, show_variables, project):
             click.echo(f"Total versions: {len(metadata['versions'])}")
             
             if show_tags:
-                tags = tag_manager.list_tags(name, project=prompt_project)
+                tags = TagManager(manager.prompts_dir).list_tags(name, project=prompt_project)
                 if tags:
                     click.echo(f"\nTags:")
                     for tag_name, tag_obj in tags.items():
@@ -439,12 +449,13 @@ def prompt_list(name, show_tags, show_variables, project):
             if not project:
                 for prompt_dir in sorted(root_level_prompts, key=lambda p: p.name):
                     prompt_name = prompt_dir.name
-                    metadata = manager.list_versions(prompt_name, project=None)
-                    if metadata and metadata['versions']:
+                    # Only the latest version and count are shown, so skip
+                    # building the full per-version listing
+                    summary = manager.get_version_summary(prompt_name, project=None)
+                    if summary:
                         if '(root)' not in projects_data:
                             projects_data['(root)'] = []
-                        version_count = len(metadata['versions'])
-                        current_ver = metadata['versions'][-1]['version']
+                        current_ver, version_count = summary
                         projects_data['(root)'].append({
                             'name': prompt_name,
                             'version': current_ver,
@@ -458,12 +469,11 @@ def prompt_list(name, show_tags, show_variables, project):
                 prompt_dirs = [d for d in project_dir.iterdir() if d.is_dir() and not d.name.startswith('.')]
                 for prompt_dir in sorted(prompt_dirs, key=lambda p: p.name):
                     prompt_name = prompt_dir.name
-                    metadata = manager.list_versions(prompt_name, project=project_name)
-                    if metadata and metadata['versions']:
+                    summary = manager.get_version_summary(prompt_name, project=project_name)
+                    if summary:
                         if project_name not in projects_data:
                             projects_data[project_name] = []
-                        version_count = len(metadata['versions'])
-                        current_ver = metadata['versions'][-1]['version']
+                        current_ver, version_count = summary
                         projects_data[project_name].append({
                             'name': prompt_name,
                             'version': current_ver,
@@ -793,12 +803,13 @@ def render(prompt_name, version, label, var, project):
             key, value = v.split('=', 1)
             var_dict[key] = value
         
-        # Validate and render
-        is_valid, missing = var_engine.validate_variables(content, var_dict)
+        # Validate and render from a single parse
+        required, template = var_engine.prepare(content)
+        is_valid, missing = var_engine.validate_variables_against(required, var_dict)
         if not is_valid:
             raise VariableMissingError(missing)
         
-        rendered = var_engine.render(content, var_dict)
+        rendered = template.render(**var_dict)
         click.echo(rendered)
         
     except PromptNotFoundError as e:
@@ -919,7 +930,7 @@ def secret_set(key, provider, project):
             if key not in manager.SUPPORTED_PROVIDERS:
                 click.echo(f"❌ Error: Unsupported provider '{key}'", err=True)
                 click.echo(f"\nSupported providers:", err=True)
-                for p in manager.SUPPORTED_PROVIDERS:
+                for p in manager.SUPPORTED_PROVIDERS_LIST:
                     click.echo(f"  - {p}", err=True)
                 sys.exit(1)
             
@@ -993,7 +1004,7 @@ def secret_get(key, provider, project):
         promptv secret get API_KEY --project my-app
     """
     try:
-        manager = SecretsManager()
+        manager = SecretsManager(lazy_init=True)
         
         if provider:
             # Get provider API key
@@ -1057,7 +1068,7 @@ def secret_list(project):
         promptv secret list --project default
     """
     try:
-        manager = SecretsManager()
+        manager = SecretsManager(lazy_init=True)
         all_secrets = manager.list_all_secrets(project=project)
         
         providers = all_secrets.get('providers', [])
@@ -1192,7 +1203,7 @@ def secret_test(provider):
         promptv secret test anthropic
     """
     try:
-        manager = SecretsManager()
+        manager = SecretsManager(lazy_init=True)
         
         if manager.has_api_key(provider):
             click.echo(f"✓ API key for '{provider}' is configured")
@@ -1215,6 +1226,44 @@ def secret_test(provider):
         sys.exit(1)
 
 
+def render_secrets(manager, *, project, output_format, include_providers):
+    """
+    Render a project's secrets in one of the `secret export` formats.
+    
+    Kept separate from the command so the formatting can be used (and
+    tested) without going through Click.
+    
+    Args:
+        manager: SecretsManager to read from
+        project: Project whose secrets to render
+        output_format: 'dotenv', 'shell' or 'json'
+        include_providers: Include provider API keys as <PROVIDER>_API_KEY
+    
+    Returns:
+        Tuple of (rendered text, number of secrets); the text is empty
+        when the project has no secrets
+    """
+    secrets = manager.get_project_secrets_with_values(
+        project=project,
+        include_providers=include_providers
+    )
+    
+    if not secrets:
+        return "", 0
+    
+    if output_format == 'json':
+        import json
+        return json.dumps(secrets, indent=2), len(secrets)
+    
+    if output_format == 'dotenv':
+        lines = [f'{key}={value}' for key, value in sorted(secrets.items())]
+    else:  # shell format
+        lines = [f'export {key}="{value}"' for key, value in sorted(secrets.items())]
+        lines.append(f"# Activated {len(secrets)} secret(s) from project '{project}'")
+    
+    return "\n".join(lines), len(secrets)
+
+
 @secret.command('export')
 @click.option('--project', default='default',
               help='Project name to export secrets from (default: "default")')
@@ -1266,28 +1315,19 @@ def secret_export(project, output_format, include_providers):
         promptv secret export --project moonshoot --format json
     """
     try:
-        manager = SecretsManager()
-        secrets = manager.get_project_secrets_with_values(
+        manager = SecretsManager(lazy_init=True)
+        text, count = render_secrets(
+            manager,
             project=project,
+            output_format=output_format,
             include_providers=include_providers
         )
         
-        if not secrets:
+        if not count:
             click.echo(f"# No secrets found for project '{project}'", err=True)
             return
         
-        if output_format == 'json':
-            import json
-            click.echo(json.dumps(secrets, indent=2))
-        
-        elif output_format == 'dotenv':
-            for key, value in sorted(secrets.items()):
-                click.echo(f'{key}={value}')
-        
-        else:  # shell format
-            for key, value in sorted(secrets.items()):
-                click.echo(f'export {key}="{value}"')
-            click.echo(f"# Activated {len(secrets)} secret(s) from project '{project}'")
+        click.echo(text)
         
     except SecretsManagerError as e:
         click.echo(f"# Error: {e}", err=True)
@@ -1354,17 +1394,23 @@ def cost_estimate(prompt_name, version, label, var, model, provider, output_toke
         else:
             content, metadata = manager.get_prompt_with_metadata(prompt_name, project=project)
 
-        # Render with variables if provided
+        estimator = CostEstimator()
+
+        # Render with variables if provided; unrendered content can reuse
+        # the token count stored at commit time
+        input_tokens = None
         if variables:
             content = var_engine.render(content, variables)
+        else:
+            input_tokens = estimator.count_version_tokens(metadata, content, model, provider)
 
         # Estimate cost
-        estimator = CostEstimator()
         cost = estimator.estimate_cost(
             text=content,
             model=model,
             provider=provider,
-            estimated_output_tokens=output_tokens
+            estimated_output_tokens=output_tokens,
+            input_tokens=input_tokens
         )
 
         # Display result
@@ -1432,13 +1478,14 @@ def cost_tokens(prompt_name, version, label, var, model, provider, project):
         else:
             content, metadata = manager.get_prompt_with_metadata(prompt_name, project=project)
 
-        # Render with variables if provided
+        # Count tokens (unrendered content can reuse the count stored at
+        # commit time)
+        estimator = CostEstimator()
         if variables:
             content = var_engine.render(content, variables)
-
-        # Count tokens
-        estimator = CostEstimator()
-        count = estimator.count_tokens(content, model, provider)
+            count = estimator.count_tokens(content, model, provider)
+        else:
+            count = estimator.count_version_tokens(metadata, content, model, provider)
 
         # Display result
         format_token_count(count, model, provider)
@@ -1468,7 +1515,8 @@ def cost_tokens(prompt_name, version, label, var, model, provider, project):
 @click.option('--models', '-m', multiple=True, help='Models to compare in provider/model format (e.g., openai/gpt-4)')
 @click.option('--output-tokens', '-o', type=int, default=500, help='Estimated output tokens (default: 500)')
 @click.option('--project', default='default', help='Project name (default: default)')
-def cost_compare(prompt_name, version, label, var, models, output_tokens, project):
+@click.option('--plain', is_flag=True, help='Print an unstyled text table (for scripts and pipes)')
+def cost_compare(prompt_name, version, label, var, models, output_tokens, project, plain):
     """
     Compare costs across multiple models.
 
@@ -1477,6 +1525,7 @@ def cost_compare(prompt_name, version, label, var, models, output_tokens, projec
         promptv cost compare my-prompt --label prod -m anthropic/claude-3-sonnet -m openai/gpt-4
         promptv cost compare my-prompt --var name=Alice -m openai/gpt-4o -m google/gemini-1.5-pro
         promptv cost compare my-prompt -m openai/gpt-4 -m anthropic/claude-3-sonnet --project my-app
+        promptv cost compare my-prompt -m openai/gpt-4 -m openai/gpt-4o --plain
     """
     try:
         manager = PromptManager()
@@ -1532,7 +1581,7 @@ def cost_compare(prompt_name, version, label, var, models, output_tokens, projec
         comparisons = estimator.compare_costs(content, model_list, output_tokens)
 
         # Display results
-        format_cost_comparison(comparisons)
+        format_cost_comparison(comparisons, plain=plain)
 
     except PromptNotFoundError as e:
         format_error(str(e), "Use 'promptv prompt list' to see available prompts")
@@ -1667,7 +1716,7 @@ def initialize_promptv_directory(silent: bool = False) -> dict:
     Returns:
         Dictionary with creation status for each component
     """
-    base_dir = Path.home() / ".promptv"
+    base_dir = get_base_dir()
     config_dir = base_dir / ".config"
     secrets_dir = base_dir / ".secrets"
     prompts_dir = base_dir / "prompts"
@@ -1767,7 +1816,7 @@ def init(force):
         promptv init --force
     """
     try:
-        base_dir = Path.home() / ".promptv"
+        base_dir = get_base_dir()
         
         # Handle force mode
         if force:
@@ -1962,7 +2011,7 @@ def test(prompt_name, version, project, llm, provider, endpoint, custom_endpoint
             effective_api_key = api_key
         else:
             # Get from secrets
-            secrets_mgr = SecretsManager()
+            secrets_mgr = SecretsManager(lazy_init=True)
             effective_api_key = secrets_mgr.get_api_key(provider_name)
             
             if not effective_api_key and not custom_endpoint:
@@ -8,6 +8,8 @@ from pydantic import ValidationError
 
 from promptv.models import Config
 from promptv.exceptions import PromptVError
+from promptv.paths import get_base_dir
+from promptv.resources import safe_load_yaml
 
 
 class ConfigManagerError(PromptVError):
@@ -91,7 +93,7 @@ llm_providers:
         if config_path:
             self.config_path = config_path
         else:
-            base_dir = Path.home() / ".promptv"
+            base_dir = get_base_dir()
             config_dir = base_dir / ".config"
             config_dir.mkdir(parents=True, exist_ok=True)
             self.config_path = config_dir / "config.yaml"
@@ -123,7 +125,7 @@ llm_providers:
         """
         try:
             with open(self.config_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+                data = safe_load_yaml(f)
             
             if data is None:
                 # Empty config file, use defaults
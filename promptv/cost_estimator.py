@@ -1,11 +1,14 @@
 """
 Cost estimation using tiktoken for token counting.
 """
+import hashlib
+import threading
 import tiktoken
-from typing import Dict, Optional
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 from pathlib import Path
 
-from promptv.models import CostEstimate
+from promptv.models import CostEstimate, VersionMetadata
 from promptv.resources import load_pricing_data, get_model_pricing
 from promptv.exceptions import PromptVError
 
@@ -25,6 +28,33 @@ class TokenizationError(CostEstimatorError):
     pass
 
 
+# Number of token counts memoized across estimator instances
+TOKEN_COUNT_CACHE_SIZE = 1024
+
+# (encoder, blake2b digest of the text) -> token count, least recently used first.
+# Keying on a digest keeps the cache small however large the prompts are.
+_TOKEN_COUNT_CACHE: "OrderedDict[Tuple[tiktoken.Encoding, bytes], int]" = OrderedDict()
+_TOKEN_COUNT_LOCK = threading.Lock()
+
+
+def _cached_token_count(encoder: tiktoken.Encoding, text: str) -> int:
+    """Count tokens in text, memoized per encoder (tiktoken shares one per encoding)."""
+    key = (encoder, hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest())
+    with _TOKEN_COUNT_LOCK:
+        count = _TOKEN_COUNT_CACHE.get(key)
+        if count is not None:
+            _TOKEN_COUNT_CACHE.move_to_end(key)
+            return count
+    
+    count = len(encoder.encode(text))
+    with _TOKEN_COUNT_LOCK:
+        _TOKEN_COUNT_CACHE[key] = count
+        _TOKEN_COUNT_CACHE.move_to_end(key)
+        if len(_TOKEN_COUNT_CACHE) > TOKEN_COUNT_CACHE_SIZE:
+            _TOKEN_COUNT_CACHE.popitem(last=False)
+    return count
+
+
 class CostEstimator:
     """
     Cost estimator for LLM API calls using tiktoken.
@@ -56,6 +86,26 @@ class CostEstimator:
         self.pricing = pricing_data if pricing_data else load_pricing_data()
         self._encoders: Dict[str, tiktoken.Encoding] = {}  # Cache for tokenizers
     
+    def get_encoding_name(self, model: str = "gpt-4", provider: str = "openai") -> str:
+        """
+        Get the tiktoken encoding used to count tokens for a model.
+        
+        Args:
+            model: Model name (default: "gpt-4")
+            provider: Provider name (default: "openai")
+        
+        Returns:
+            Encoding name (e.g. 'cl100k_base')
+        
+        Raises:
+            UnknownModelError: If model pricing not found
+        """
+        try:
+            model_pricing = get_model_pricing(provider, model)
+        except ValueError as e:
+            raise UnknownModelError(str(e)) from e
+        return model_pricing.get('encoding', 'cl100k_base')
+    
     def count_tokens(self, text: str, model: str = "gpt-4", provider: str = "openai") -> int:
         """
         Count tokens in text using tiktoken.
@@ -74,8 +124,7 @@ class CostEstimator:
         """
         try:
             # Get encoding name for the model
-            model_pricing = get_model_pricing(provider, model)
-            encoding_name = model_pricing.get('encoding', 'cl100k_base')
+            encoding_name = self.get_encoding_name(model, provider)
             
             # Get or create encoder (with caching)
             if encoding_name not in self._encoders:
@@ -83,10 +132,12 @@ class CostEstimator:
             
             encoder = self._encoders[encoding_name]
             
-            # Count tokens
-            tokens = encoder.encode(text)
-            return len(tokens)
+            # Count tokens (repeat counts of the same text are served from
+            # cache, e.g. one prompt compared across several models)
+            return _cached_token_count(encoder, text)
             
+        except UnknownModelError:
+            raise
         except ValueError as e:
             if "not found" in str(e).lower():
                 raise UnknownModelError(str(e)) from e
@@ -94,12 +145,48 @@ class CostEstimator:
         except Exception as e:
             raise TokenizationError(f"Failed to tokenize text: {e}") from e
     
+    def count_version_tokens(
+        self,
+        version_meta: VersionMetadata,
+        text: str,
+        model: str = "gpt-4",
+        provider: str = "openai"
+    ) -> int:
+        """
+        Count tokens in a committed prompt version.
+        
+        Reuses the token count stored in the version metadata at commit time
+        when it was measured with the same encoding as the requested model;
+        otherwise tokenizes the text.
+        
+        Args:
+            version_meta: Metadata of the version the text was read from
+            text: The version's (unrendered) content
+            model: Model name (default: "gpt-4")
+            provider: Provider name (default: "openai")
+        
+        Returns:
+            Number of tokens
+        
+        Raises:
+            TokenizationError: If tokenization fails
+            UnknownModelError: If model pricing not found
+        """
+        if (
+            version_meta.token_count is not None
+            and version_meta.token_encoding is not None
+            and version_meta.token_encoding == self.get_encoding_name(model, provider)
+        ):
+            return version_meta.token_count
+        return self.count_tokens(text, model, provider)
+    
     def estimate_cost(
         self,
         text: str,
         model: str,
         provider: str,
-        estimated_output_tokens: int = 500
+        estimated_output_tokens: int = 500,
+        input_tokens: Optional[int] = None
     ) -> CostEstimate:
         """
         Estimate cost for a prompt.
@@ -109,6 +196,7 @@ class CostEstimator:
             model: Model name (e.g., 'gpt-4', 'claude-3-opus')
             provider: Provider name (e.g., 'openai', 'anthropic')
             estimated_output_tokens: Estimated number of output tokens (default: 500)
+            input_tokens: Already-known input token count; skips tokenizing text
         
         Returns:
             CostEstimate object with detailed cost breakdown
@@ -129,7 +217,8 @@ class CostEstimator:
             >>> print(f"Total cost: ${cost.total_cost:.4f}")
         """
         # Count input tokens
-        input_tokens = self.count_tokens(text, model, provider)
+        if input_tokens is None:
+            input_tokens = self.count_tokens(text, model, provider)
         
         # Get pricing information
         try:
@@ -99,7 +99,7 @@ class OpenAIProvider(LLMProvider):
             from openai import OpenAI
         except ImportError as e:
             raise LLMProviderError(
-                "OpenAI library not installed. Install with: pip install openai>=1.0.0"
+                "OpenAI library not installed. Install with: pip install 'promptv[providers]'"
             ) from e
         
         self.model = model
@@ -234,7 +234,7 @@ class AnthropicProvider(LLMProvider):
             from anthropic import Anthropic
         except ImportError as e:
             raise LLMProviderError(
-                "Anthropic library not installed. Install with: pip install anthropic>=0.18.0"
+                "Anthropic library not installed. Install with: pip install 'promptv[providers]'"
             ) from e
         
         self.model = model
@@ -373,7 +373,7 @@ class OpenRouterProvider(LLMProvider):
             from openai import OpenAI
         except ImportError as e:
             raise LLMProviderError(
-                "OpenAI library not installed. Install with: pip install openai>=1.0.0"
+                "OpenAI library not installed. Install with: pip install 'promptv[providers]'"
             ) from e
         
         self.model = model
@@ -4,10 +4,12 @@ import shutil
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, List, Dict, Tuple
+from pydantic import ValidationError
 from promptv.models import PromptMetadata, VersionMetadata
 from promptv.variable_engine import VariableEngine
 from promptv.exceptions import PromptNotFoundError, VersionNotFoundError, MetadataCorruptedError
 from promptv.config_manager import ConfigManager
+from promptv.paths import get_base_dir
 
 
 # Lazy import to avoid circular dependency
@@ -24,16 +26,18 @@ class PromptManager:
         self.config_manager = ConfigManager()
         self.config = self.config_manager.get_config()
         
+        # Kept for callers that read it; base_dir may be elsewhere when
+        # relocated with $PROMPTV_BASE_DIR or --base-dir
         self.home_dir = Path.home()
         
         # Determine base directory based on execution mode
         if self.config.execution.mode == "cloud":
             # Cloud mode - still use local cache but mark for cloud sync
-            self.base_dir = self.home_dir / ".promptv"
+            self.base_dir = get_base_dir()
             self.is_cloud_mode = True
         else:
             # Local mode
-            self.base_dir = self.home_dir / ".promptv"
+            self.base_dir = get_base_dir()
             self.is_cloud_mode = False
         
         self.config_dir = self.base_dir / ".config"
@@ -76,26 +80,25 @@ class PromptManager:
             )
         
         try:
-            with open(metadata_file, 'r') as f:
-                data = json.load(f)
+            raw = metadata_file.read_bytes()
+        except OSError as e:
+            raise MetadataCorruptedError(name, str(e))
+        
+        try:
+            # Current format: parse and validate in one pass with
+            # pydantic-core's JSON parser (ISO timestamps become datetimes)
+            return PromptMetadata.model_validate_json(raw)
+        except ValidationError:
+            pass
+        
+        try:
+            data = json.loads(raw)
             
             # Check if this is old format (just versions list)
             if "versions" in data and "current_version" not in data:
                 # Migrate old format to new format
                 return self._migrate_metadata(name, data)
             
-            # Parse as new format
-            # Convert timestamp strings back to datetime objects
-            if isinstance(data.get("created_at"), str):
-                data["created_at"] = datetime.fromisoformat(data["created_at"])
-            if isinstance(data.get("updated_at"), str):
-                data["updated_at"] = datetime.fromisoformat(data["updated_at"])
-            
-            # Convert version timestamps
-            for version_data in data.get("versions", []):
-                if isinstance(version_data.get("timestamp"), str):
-                    version_data["timestamp"] = datetime.fromisoformat(version_data["timestamp"])
-            
             return PromptMetadata(**data)
             
         except Exception as e:
@@ -153,17 +156,11 @@ class PromptManager:
         metadata_file = self._get_metadata_file(metadata.name, project=project)
         metadata_file.parent.mkdir(parents=True, exist_ok=True)
         
-        data = metadata.model_dump(mode='json')
-        
-        data["created_at"] = metadata.created_at.isoformat()
-        data["updated_at"] = metadata.updated_at.isoformat()
-        
-        for version_data in data["versions"]:
-            if "timestamp" in version_data:
-                version_data["timestamp"] = version_data["timestamp"]
+        # Serialize in pydantic-core (ISO timestamps, same layout as before)
+        data = metadata.model_dump_json(indent=2)
         
-        with open(metadata_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        with open(metadata_file, 'w', encoding='utf-8') as f:
+            f.write(data)
     
     def _convert_to_markdown(self, content: str, source_path: Optional[str] = None) -> str:
         """Convert content to markdown format if needed."""
@@ -191,13 +188,20 @@ class PromptManager:
             >>> manager = PromptManager()
             >>> tokens = manager.count_tokens("Hello, world!", model="gpt-4")
         """
+        return self._measure_tokens(content, model, provider)[0]
+    
+    def _measure_tokens(self, content: str, model: str = "gpt-4", provider: str = "openai") -> Tuple[int, Optional[str]]:
+        """Count tokens, returning (count, tiktoken encoding or None if estimated)."""
         try:
             estimator = _get_cost_estimator()
-            return estimator.count_tokens(content, model, provider)
+            return (
+                estimator.count_tokens(content, model, provider),
+                estimator.get_encoding_name(model, provider)
+            )
         except Exception:
             # Fallback to simple word-based estimate if tiktoken fails
             words = content.split()
-            return int(len(words) * 1.3)
+            return int(len(words) * 1.3), None
     
     def get_prompt_with_metadata(self, name: str, version: str = "latest", project: Optional[str] = None) -> Tuple[str, VersionMetadata]:
         """
@@ -261,52 +265,16 @@ class PromptManager:
         with open(source_path, 'r') as f:
             content = f.read()
         
-        # Convert to markdown if needed
-        content = self._convert_to_markdown(content, str(source_path))
-        
         # Load existing metadata
         metadata = self._load_metadata(name, project=project)
         
-        # Get next version number
-        version = metadata.current_version + 1
-        
-        # Create prompt directory
-        prompt_dir = self._get_prompt_dir(name, project=project)
-        prompt_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Save the prompt file
-        prompt_file = prompt_dir / f"v{version}.md"
-        with open(prompt_file, 'w') as f:
-            f.write(content)
-        
-        variables = self.extract_variables(content)
-        
-        token_count = self.count_tokens(content)
-        
-        now = datetime.now()
-        version_info = VersionMetadata(
-            version=version,
-            timestamp=now,
-            source_file=str(source_path),
-            file_path=str(prompt_file),
-            message=message,
-            variables=variables,
-            token_count=token_count
+        result = self._add_version(
+            metadata, content, message=message, project=project, source_file=str(source_path)
         )
         
-        metadata.versions.append(version_info)
-        metadata.current_version = version
-        metadata.updated_at = now
-        if not metadata.versions or version == 1:
-            metadata.created_at = now
-        
         self._save_metadata(metadata, project=project)
         
-        return {
-            "name": name,
-            "version": version,
-            "file_path": str(prompt_file)
-        }
+        return result
     
     def set_prompt(self, name: str, content: str, message: Optional[str] = None, project: Optional[str] = None) -> Dict:
         """
@@ -324,6 +292,64 @@ class PromptManager:
         # Load existing metadata
         metadata = self._load_metadata(name, project=project)
         
+        result = self._add_version(metadata, content, message=message, project=project)
+        
+        self._save_metadata(metadata, project=project)
+        
+        return result
+    
+    def bulk_set_prompts(
+        self,
+        items: List[Tuple[str, str, Optional[str], Optional[str]]]
+    ) -> List[Dict]:
+        """
+        Set/update many prompts, writing each prompt's metadata only once.
+        
+        Equivalent to calling set_prompt() for every item in order, but
+        metadata.json is loaded and saved once per distinct prompt rather
+        than once per item, which makes loading fixtures or imports cheaper.
+        
+        Args:
+            items: (name, content, project, message) tuples; a name may
+                repeat to add several versions
+            
+        Returns:
+            List of dictionaries with set information, one per item
+        
+        Example:
+            >>> manager.bulk_set_prompts([
+            ...     ("greeting", "Hello {{name}}", "my-app", None),
+            ...     ("greeting", "Hi {{name}}", "my-app", "Shorter"),
+            ... ])
+        """
+        loaded: Dict[Tuple[str, Optional[str]], PromptMetadata] = {}
+        results = []
+        
+        for name, content, project, message in items:
+            key = (name, project)
+            metadata = loaded.get(key)
+            if metadata is None:
+                metadata = loaded[key] = self._load_metadata(name, project=project)
+            results.append(
+                self._add_version(metadata, content, message=message, project=project)
+            )
+        
+        for (name, project), metadata in loaded.items():
+            self._save_metadata(metadata, project=project)
+        
+        return results
+    
+    def _add_version(
+        self,
+        metadata: PromptMetadata,
+        content: str,
+        message: Optional[str] = None,
+        project: Optional[str] = None,
+        source_file: Optional[str] = None
+    ) -> Dict:
+        """Write the next version's file and record it in metadata (not saved)."""
+        name = metadata.name
+        
         # Get next version number
         version = metadata.current_version + 1
         
@@ -332,7 +358,7 @@ class PromptManager:
         prompt_dir.mkdir(parents=True, exist_ok=True)
         
         # Convert to markdown
-        content = self._convert_to_markdown(content)
+        content = self._convert_to_markdown(content, source_file)
         
         # Save the prompt file
         prompt_file = prompt_dir / f"v{version}.md"
@@ -343,17 +369,18 @@ class PromptManager:
         variables = self.extract_variables(content)
         
         # Count tokens
-        token_count = self.count_tokens(content)
+        token_count, token_encoding = self._measure_tokens(content)
         
         now = datetime.now()
         version_info = VersionMetadata(
             version=version,
             timestamp=now,
-            source_file=None,
+            source_file=source_file,
             file_path=str(prompt_file),
             message=message,
             variables=variables,
-            token_count=token_count
+            token_count=token_count,
+            token_encoding=token_encoding
         )
         
         metadata.versions.append(version_info)
@@ -362,8 +389,6 @@ class PromptManager:
         if not metadata.versions or version == 1:
             metadata.created_at = now
         
-        self._save_metadata(metadata, project=project)
-        
         return {
             "name": name,
             "version": version,
@@ -431,6 +456,30 @@ class PromptManager:
         except Exception:
             return None
     
+    def get_version_summary(self, name: str, project: Optional[str] = None) -> Optional[Tuple[int, int]]:
+        """
+        Get the latest version number and the version count for a prompt.
+        
+        Cheaper than list_versions() when only these two numbers are needed,
+        since no per-version dictionaries are built.
+        
+        Args:
+            name: Name of the prompt
+            project: Optional project name
+            
+        Returns:
+            Tuple of (latest_version, version_count), or None if the prompt
+            doesn't exist, has no versions or its metadata can't be read
+        """
+        try:
+            metadata = self._load_metadata(name, project=project)
+        except MetadataCorruptedError:
+            return None
+        
+        if not metadata.versions:
+            return None
+        return metadata.versions[-1].version, len(metadata.versions)
+    
     def remove_prompts(self, names: List[str], project: Optional[str] = None) -> Dict[str, bool]:
         """
         Remove one or more prompts by name.
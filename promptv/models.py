@@ -20,6 +20,7 @@ class VersionMetadata(BaseModel):
     message: Optional[str] = None  # Commit message
     variables: List[str] = Field(default_factory=list)  # Extracted Jinja2 variables
     token_count: Optional[int] = None  # Cached token count
+    token_encoding: Optional[str] = None  # tiktoken encoding token_count was measured with
 
 
 class PromptMetadata(BaseModel):
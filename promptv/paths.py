@@ -0,0 +1,55 @@
+"""
+Filesystem locations used by promptv.
+"""
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Iterator, Optional
+
+# Environment variable that overrides the default ~/.promptv location
+BASE_DIR_ENV_VAR = "PROMPTV_BASE_DIR"
+
+# Set by base_dir_override(); local to the current thread/context
+_base_dir_override: ContextVar[Optional[Path]] = ContextVar("promptv_base_dir", default=None)
+
+
+def get_base_dir() -> Path:
+    """
+    Resolve the promptv base directory.
+    
+    Returns:
+        The active base_dir_override() path if any, else $PROMPTV_BASE_DIR
+        if set, otherwise ~/.promptv
+    """
+    override = _base_dir_override.get()
+    if override is not None:
+        return override
+    
+    env_override = os.environ.get(BASE_DIR_ENV_VAR)
+    if env_override:
+        return Path(env_override)
+    return Path.home() / ".promptv"
+
+
+@contextmanager
+def base_dir_override(base_dir: Path) -> Iterator[Path]:
+    """
+    Make get_base_dir() return base_dir inside the block.
+    
+    The override lives in a context variable rather than the process
+    environment, so other threads (which run in their own context) keep
+    resolving the usual location.
+    
+    Args:
+        base_dir: Directory to use instead of ~/.promptv
+    
+    Examples:
+        >>> with base_dir_override(Path("/tmp/promptv")):
+        ...     manager = PromptManager()
+    """
+    token = _base_dir_override.set(base_dir)
+    try:
+        yield base_dir
+    finally:
+        _base_dir_override.reset(token)
@@ -3,8 +3,34 @@ Resources module for loading static data files.
 """
 from pathlib import Path
 import yaml
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 import re
+from promptv.paths import get_base_dir
+
+# libyaml-backed loader when PyYAML was built with it; same safe semantics
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# "# Last updated: <date>" header comment in pricing.yaml
+_PRICING_DATE_RE = re.compile(r'#\s*Last updated:\s*(.+)', re.IGNORECASE)
+
+# Pricing data bundled with the package, used when the user has none
+_PACKAGE_PRICING_FILE = Path(__file__).parent / "pricing.yaml"
+
+# pricing file path -> ((mtime_ns, size), parsed data)
+_PRICING_CACHE: Dict[Path, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+
+def safe_load_yaml(stream) -> Any:
+    """
+    Parse YAML with the fastest available safe loader.
+    
+    Args:
+        stream: Open file object or string with YAML content
+    
+    Returns:
+        Parsed YAML data
+    """
+    return yaml.load(stream, Loader=_YAML_LOADER)
 
 
 def get_pricing_file_path() -> Path:
@@ -18,13 +44,39 @@ def get_pricing_file_path() -> Path:
         Path to pricing.yaml (user config or package resource)
     """
     # Check user config first
-    user_pricing = Path.home() / ".promptv" / ".config" / "pricing.yaml"
+    user_pricing = get_base_dir() / ".config" / "pricing.yaml"
     if user_pricing.exists():
         return user_pricing
     
     # Fallback to package resource
-    resources_dir = Path(__file__).parent
-    return resources_dir / "pricing.yaml"
+    return _PACKAGE_PRICING_FILE
+
+
+def _parse_pricing_file(pricing_file: Path) -> Dict[str, Any]:
+    """
+    Parse a pricing file, reusing the last result while the file is unchanged.
+    
+    Args:
+        pricing_file: Path to a pricing.yaml file
+    
+    Returns:
+        Parsed pricing data (shared; do not mutate)
+    
+    Raises:
+        OSError: If the file cannot be read
+        yaml.YAMLError: If the file is not valid YAML
+    """
+    st = pricing_file.stat()
+    file_key = (st.st_mtime_ns, st.st_size)
+    cached = _PRICING_CACHE.get(pricing_file)
+    if cached is not None and cached[0] == file_key:
+        return cached[1]
+    
+    with open(pricing_file, 'r', encoding='utf-8') as f:
+        data = safe_load_yaml(f)
+    
+    _PRICING_CACHE[pricing_file] = (file_key, data)
+    return data
 
 
 def load_pricing_data() -> Dict[str, Any]:
@@ -32,28 +84,30 @@ def load_pricing_data() -> Dict[str, Any]:
     Load pricing data from pricing.yaml.
     
     Uses get_pricing_file_path() to determine source (user config or package resource).
-    Adds metadata about the source to the returned data.
+    Adds metadata about the source to the returned data. The parsed file is
+    cached in-process and re-read only when its mtime or size changes.
     
     Returns:
         Dictionary with pricing data for all providers and models.
     """
     pricing_file = get_pricing_file_path()
+    # Anything but the bundled file lives in the user's base directory, which
+    # may be relocated with $PROMPTV_BASE_DIR or --base-dir
+    is_user_config = pricing_file != _PACKAGE_PRICING_FILE
     
     if not pricing_file.exists():
         raise FileNotFoundError(f"Pricing data not found at {pricing_file}")
     
     try:
-        with open(pricing_file, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+        data = _parse_pricing_file(pricing_file)
     except yaml.YAMLError as e:
         # If user config is corrupted, try falling back to package resource
-        if 'promptv/.config' in str(pricing_file):
-            resources_dir = Path(__file__).parent
-            fallback_file = resources_dir / "pricing.yaml"
+        if is_user_config:
+            fallback_file = _PACKAGE_PRICING_FILE
             if fallback_file.exists():
-                with open(fallback_file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
+                data = _parse_pricing_file(fallback_file)
                 pricing_file = fallback_file
+                is_user_config = False
             else:
                 raise FileNotFoundError(
                     f"Failed to parse user pricing.yaml and package resource not found"
@@ -61,10 +115,13 @@ def load_pricing_data() -> Dict[str, Any]:
         else:
             raise
     
+    # Shallow copy so the cached data never carries per-call metadata
+    data = dict(data)
+    
     # Add metadata about source
     data['_source'] = {
         'path': str(pricing_file),
-        'is_user_config': '.promptv/.config' in str(pricing_file)
+        'is_user_config': is_user_config
     }
     
     return data
@@ -93,7 +150,7 @@ def get_pricing_data_date() -> str:
                     break
                 
                 # Look for pattern: # Last updated: <date>
-                match = re.search(r'#\s*Last updated:\s*(.+)', line, re.IGNORECASE)
+                match = _PRICING_DATE_RE.search(line)
                 if match:
                     return match.group(1).strip()
         
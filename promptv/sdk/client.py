@@ -17,8 +17,9 @@ from ..tag_manager import TagManager
 from ..variable_engine import VariableEngine
 from ..secrets_manager import SecretsManager
 from ..models import VersionMetadata, PromptMetadata, CostEstimate
-from ..exceptions import PromptNotFoundError, TagNotFoundError
+from ..exceptions import PromptNotFoundError, TagNotFoundError, VersionNotFoundError
 from ..cost_estimator import CostEstimator
+from ..paths import get_base_dir
 
 logger = logging.getLogger(__name__)
 
@@ -73,7 +74,7 @@ class PromptClient:
             base_dir: Optional custom base directory (default: ~/.promptv)
             cache_ttl: Cache TTL in seconds (default: 300)
         """
-        self.base_dir = base_dir or Path.home() / ".promptv"
+        self.base_dir = base_dir or get_base_dir()
         self.cache_ttl = cache_ttl
         self.manager = PromptManager()
         if base_dir:
@@ -84,9 +85,10 @@ class PromptClient:
         self.variable_engine = VariableEngine()
         self.cache: Dict[str, CachedPrompt] = {}
         
-        # Initialize SecretsManager for secrets management
+        # Initialize SecretsManager for secrets management; storage is only
+        # created on the first write, so prompt-only clients never touch it
         secrets_dir = self.base_dir / ".secrets" if base_dir else None
-        self.secrets_manager = SecretsManager(secrets_dir=secrets_dir)
+        self.secrets_manager = SecretsManager(secrets_dir=secrets_dir, lazy_init=True)
         
         logger.debug(f"Initialized PromptClient with base_dir={self.base_dir}, cache_ttl={cache_ttl}")
     
@@ -151,16 +153,7 @@ class PromptClient:
                 del self.cache[cache_key]
         
         # Resolve version from tag/label
-        version_ref = "latest"
-        if label:
-            metadata = self.manager._load_metadata(name)
-            if not metadata.versions:
-                raise PromptNotFoundError(name)
-            max_version = metadata.current_version
-            version_num = self.tag_manager.resolve_version(name, label, max_version)
-            version_ref = str(version_num)
-        elif version is not None:
-            version_ref = str(version)
+        version_ref = self._resolve_version_ref(name, label, version)
         
         # Get prompt content
         content = self.manager.get_prompt(name, version_ref)
@@ -317,6 +310,39 @@ class PromptClient:
         # tags_dict is Dict[str, Tag], convert to Dict[str, int]
         return {tag_name: tag.version for tag_name, tag in tags_dict.items()}
     
+    def _resolve_version_ref(self, name: str, label: Optional[str], version: Optional[int]) -> str:
+        """Resolve a label or version number to a version reference string."""
+        if label:
+            metadata = self.manager._load_metadata(name)
+            if not metadata.versions:
+                raise PromptNotFoundError(name)
+            max_version = metadata.current_version
+            return str(self.tag_manager.resolve_version(name, label, max_version))
+        if version is not None:
+            return str(version)
+        return "latest"
+    
+    def _version_content_and_tokens(
+        self,
+        estimator: CostEstimator,
+        name: str,
+        label: Optional[str],
+        version: Optional[int],
+        model: str,
+        provider: str
+    ) -> Tuple[str, int]:
+        """Get an unrendered prompt version and its token count, reusing the stored count."""
+        if label and version:
+            raise ValueError("Cannot specify both 'label' and 'version'")
+        
+        version_ref = self._resolve_version_ref(name, label, version)
+        try:
+            content, version_meta = self.manager.get_prompt_with_metadata(name, version_ref)
+        except VersionNotFoundError:
+            # Same error get_prompt raises for a missing version
+            raise PromptNotFoundError(name)
+        return content, estimator.count_version_tokens(version_meta, content, model, provider)
+    
     def _cache_key(
         self,
         name: str,
@@ -422,6 +448,21 @@ class PromptClient:
             ...     model='gpt-3.5-turbo'
             ... )
         """
+        estimator = CostEstimator()
+        
+        if not variables:
+            # Unrendered version: reuse the token count stored at commit time
+            content, input_tokens = self._version_content_and_tokens(
+                estimator, name, label, version, model, provider
+            )
+            return estimator.estimate_cost(
+                text=content,
+                model=model,
+                provider=provider,
+                estimated_output_tokens=estimated_output_tokens,
+                input_tokens=input_tokens
+            )
+        
         # Get prompt content (don't use cache for cost estimation)
         content = self.get_prompt(
             name=name,
@@ -432,7 +473,6 @@ class PromptClient:
         )
         
         # Estimate cost
-        estimator = CostEstimator()
         return estimator.estimate_cost(
             text=content,
             model=model,
@@ -472,6 +512,14 @@ class PromptClient:
             >>> tokens = client.count_tokens('my-prompt', label='prod')
             >>> print(f"Token count: {tokens}")
         """
+        estimator = CostEstimator()
+        
+        if not variables:
+            # Unrendered version: reuse the token count stored at commit time
+            return self._version_content_and_tokens(
+                estimator, name, label, version, model, provider
+            )[1]
+        
         # Get prompt content
         content = self.get_prompt(
             name=name,
@@ -482,7 +530,6 @@ class PromptClient:
         )
         
         # Count tokens
-        estimator = CostEstimator()
         return estimator.count_tokens(content, model, provider)
     
     def compare_costs(
@@ -6,11 +6,17 @@ LLM providers using encrypted local file storage in ~/.promptv/.secrets
 """
 
 import json
+import os
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Iterator
 import logging
 
 from .exceptions import PromptVError
+from .paths import get_base_dir
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +53,8 @@ class SecretsManager:
     
     SERVICE_NAME = "promptv"
     
-    SUPPORTED_PROVIDERS = [
+    # Ordered list for display; the frozenset is used for membership checks
+    SUPPORTED_PROVIDERS_LIST = [
         "openai",
         "anthropic",
         "openrouter",
@@ -59,41 +66,80 @@ class SecretsManager:
         "custom"
     ]
     
-    def __init__(self, secrets_dir: Optional[Path] = None):
+    SUPPORTED_PROVIDERS = frozenset(SUPPORTED_PROVIDERS_LIST)
+    
+    # Environment variable name used when exporting each provider's API key
+    PROVIDER_ENV_VARS = {p: f"{p.upper()}_API_KEY" for p in SUPPORTED_PROVIDERS_LIST}
+    
+    # Parsed secrets shared by every instance in the process, keyed by file
+    # path and validated against the file's (mtime_ns, size) on each load
+    _shared_cache: Dict[Path, Tuple[dict, Tuple[int, int]]] = {}
+    _cache_lock = threading.RLock()
+    
+    def __init__(self, secrets_dir: Optional[Path] = None, lazy_init: bool = False):
         """
         Initialize the SecretsManager with local file storage.
         
         Args:
             secrets_dir: Optional custom secrets directory (default: ~/.promptv/.secrets)
+            lazy_init: Defer creating the secrets directory and file until the
+                first write, so read-only callers touch nothing on disk
         """
         if secrets_dir:
             self.secrets_dir = Path(secrets_dir)
         else:
-            self.secrets_dir = Path.home() / ".promptv" / ".secrets"
+            self.secrets_dir = get_base_dir() / ".secrets"
         
         self.secrets_file = self.secrets_dir / "secrets.json"
         self.project = None  # Current project context
+        self._batch_secrets: Optional[dict] = None  # Pending writes inside batch()
+        self._batch_dirty = False
+        self._initialized = False
         
         # Initialize secrets directory and file
-        self._initialize_storage()
+        if not lazy_init:
+            self._ensure_initialized()
+    
+    def _ensure_initialized(self) -> None:
+        """Run _initialize_storage once for this instance."""
+        if self._initialized:
+            return
+        # Set before initializing: _initialize_storage may call _save_secrets
+        self._initialized = True
+        try:
+            self._initialize_storage()
+        except BaseException:
+            self._initialized = False
+            raise
     
     def _initialize_storage(self) -> None:
         """Initialize the secrets storage directory and file."""
+        # Fast path: an existing secrets file with the expected mode means
+        # the directory was already set up by a previous run.
+        try:
+            st = os.stat(self.secrets_file)
+        except OSError:
+            st = None
+        if st is not None and stat.S_IMODE(st.st_mode) == 0o600:
+            return
+        
         try:
             # Create directory if it doesn't exist
             self.secrets_dir.mkdir(parents=True, exist_ok=True)
             
             # Set restrictive permissions (owner read/write only)
-            self.secrets_dir.chmod(0o700)
+            if stat.S_IMODE(os.stat(self.secrets_dir).st_mode) != 0o700:
+                os.chmod(self.secrets_dir, 0o700)
             
-            # Create secrets file if it doesn't exist
+            # Create secrets file if it doesn't exist (created with mode 0600)
             if not self.secrets_file.exists():
                 self._save_secrets({})
-                self.secrets_file.chmod(0o600)
+            else:
+                os.chmod(self.secrets_file, 0o600)
             
-            logger.debug(f"Secrets storage initialized at {self.secrets_file}")
+            logger.debug("Secrets storage initialized at %s", self.secrets_file)
             
-        except Exception as e:
+        except OSError as e:
             raise SecretsManagerError(
                 f"Failed to initialize secrets storage: {str(e)}"
             ) from e
@@ -102,24 +148,59 @@ class SecretsManager:
         """
         Load secrets from the JSON file.
         
+        The parsed dictionary is cached process-wide and reused for as long
+        as the file's mtime and size are unchanged, so it is shared with
+        every manager on the same file and must not be mutated; use
+        ``_load_secrets_for_update`` to get a copy to change.
+        
         Returns:
             Dictionary of secrets
         """
+        if self._batch_secrets is not None:
+            return self._batch_secrets
+        
         try:
-            if not self.secrets_file.exists():
-                return {}
-            
-            with open(self.secrets_file, 'r') as f:
-                data = json.load(f)
-            
-            return data
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse secrets file: {e}")
+            st = os.stat(self.secrets_file)
+        except FileNotFoundError:
             return {}
-        except Exception as e:
+        except OSError as e:
             raise SecretsManagerError(
                 f"Failed to load secrets: {str(e)}"
             ) from e
+        
+        file_key = (st.st_mtime_ns, st.st_size)
+        with self._cache_lock:
+            cached = self._shared_cache.get(self.secrets_file)
+            if cached is not None and cached[1] == file_key:
+                return cached[0]
+            
+            try:
+                with open(self.secrets_file, 'r') as f:
+                    data = json.load(f)
+            except json.JSONDecodeError as e:
+                logger.error("Failed to parse secrets file: %s", e)
+                return {}
+            except OSError as e:
+                raise SecretsManagerError(
+                    f"Failed to load secrets: {str(e)}"
+                ) from e
+            
+            self._shared_cache[self.secrets_file] = (data, file_key)
+            return data
+    
+    def _load_secrets_for_update(self) -> dict:
+        """
+        Load a private copy of the secrets for a set/delete call to modify.
+        
+        Returns:
+            Dictionary of secrets that is safe to mutate and then pass to
+            ``_save_secrets``
+        """
+        secrets = self._load_secrets()
+        if self._batch_secrets is not None:
+            # Already this batch's own copy
+            return secrets
+        return dict(secrets)
     
     def _save_secrets(self, secrets: dict) -> None:
         """
@@ -128,17 +209,92 @@ class SecretsManager:
         Args:
             secrets: Dictionary of secrets to save
         """
+        if self._batch_secrets is not None:
+            # Deferred until the enclosing batch() exits
+            self._batch_secrets = secrets
+            self._batch_dirty = True
+            return
+        
+        self._ensure_initialized()
+        
+        with self._cache_lock:
+            try:
+                # Write to a temp file in the same directory and rename it over
+                # secrets.json, so readers never see a partially written file.
+                # mkstemp creates the file owner read/write only (0600).
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=self.secrets_dir, prefix='.secrets.', suffix='.tmp'
+                )
+                try:
+                    with os.fdopen(fd, 'w') as f:
+                        json.dump(secrets, f, separators=(',', ':'))
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, self.secrets_file)
+                except BaseException:
+                    try:
+                        os.unlink(tmp_path)
+                    except OSError:
+                        pass
+                    raise
+                
+                st = os.stat(self.secrets_file)
+                self._shared_cache[self.secrets_file] = (
+                    secrets, (st.st_mtime_ns, st.st_size)
+                )
+            except BaseException as e:
+                # Whatever failed, the file may not match the cached copy
+                self._shared_cache.pop(self.secrets_file, None)
+                if isinstance(e, OSError):
+                    raise SecretsManagerError(
+                        f"Failed to save secrets: {str(e)}"
+                    ) from e
+                raise
+    
+    @contextmanager
+    def batch(self) -> Iterator["SecretsManager"]:
+        """
+        Group several set/delete calls into a single write.
+        
+        Inside the block, mutations are applied to an in-memory copy of the
+        secrets; the file is written once when the block exits. If the block
+        raises, the pending changes are discarded.
+        
+        Examples:
+            >>> manager = SecretsManager()
+            >>> with manager.batch():
+            ...     manager.set_secret("DATABASE_URL", "postgres://...", project="my-app")
+            ...     manager.set_secret("REDIS_URL", "redis://...", project="my-app")
+        """
+        if self._batch_secrets is not None:
+            # Nested batch: the outermost block owns the write
+            yield self
+            return
+        
+        self._batch_secrets = dict(self._load_secrets())
+        self._batch_dirty = False
         try:
-            with open(self.secrets_file, 'w') as f:
-                json.dump(secrets, f, indent=2)
-            
-            # Ensure file has restrictive permissions
-            self.secrets_file.chmod(0o600)
-            
-        except Exception as e:
-            raise SecretsManagerError(
-                f"Failed to save secrets: {str(e)}"
-            ) from e
+            yield self
+        except BaseException:
+            self._batch_secrets = None
+            raise
+        
+        secrets, dirty = self._batch_secrets, self._batch_dirty
+        self._batch_secrets = None
+        self._batch_dirty = False
+        if dirty:
+            self._save_secrets(secrets)
+    
+    def clear_cache(self) -> None:
+        """
+        Drop the cached secrets for this file so the next read hits disk.
+        
+        Examples:
+            >>> manager = SecretsManager()
+            >>> manager.clear_cache()
+        """
+        with self._cache_lock:
+            self._shared_cache.pop(self.secrets_file, None)
     
     def set_project(self, project: str) -> None:
         """
@@ -154,12 +310,18 @@ class SecretsManager:
         """
         self.project = project
     
-    def _get_key_name(self, key_name: str, provider: Optional[str] = None) -> str:
+    def _get_key_name(
+        self,
+        key_name: str,
+        project: Optional[str] = None,
+        provider: Optional[str] = None
+    ) -> str:
         """
         Get fully qualified key name with optional project scoping.
         
         Args:
             key_name: Base key name
+            project: Optional project name (default: current project context)
             provider: Optional provider name
         
         Returns:
@@ -170,8 +332,9 @@ class SecretsManager:
             return provider
         
         # Generic secrets can be project-scoped
-        if self.project:
-            return f"{self.project}::{key_name}"
+        project = project or self.project
+        if project:
+            return f"{project}::{key_name}"
         return key_name
     
     def set_api_key(self, provider: str, api_key: str) -> None:
@@ -193,21 +356,16 @@ class SecretsManager:
         if provider not in self.SUPPORTED_PROVIDERS:
             raise ValueError(
                 f"Unsupported provider: {provider}\n"
-                f"Supported providers: {', '.join(self.SUPPORTED_PROVIDERS)}"
+                f"Supported providers: {', '.join(self.SUPPORTED_PROVIDERS_LIST)}"
             )
         
         if not api_key or not api_key.strip():
             raise ValueError("API key cannot be empty")
         
-        try:
-            secrets = self._load_secrets()
-            secrets[provider] = api_key.strip()
-            self._save_secrets(secrets)
-            logger.info(f"API key for provider '{provider}' stored securely")
-        except Exception as e:
-            raise SecretsManagerError(
-                f"Failed to store API key for provider '{provider}': {str(e)}"
-            ) from e
+        secrets = self._load_secrets_for_update()
+        secrets[provider] = api_key.strip()
+        self._save_secrets(secrets)
+        logger.info("API key for provider '%s' stored securely", provider)
     
     def set_secret(self, key_name: str, value: str, project: Optional[str] = None) -> None:
         """
@@ -228,23 +386,59 @@ class SecretsManager:
         if not value or not value.strip():
             raise ValueError("Secret value cannot be empty")
         
-        # Temporarily override project if specified
-        old_project = self.project
-        if project:
-            self.project = project
+        qualified_name = self._get_key_name(key_name, project=project)
+        secrets = self._load_secrets_for_update()
+        secrets[qualified_name] = value.strip()
+        self._save_secrets(secrets)
+        logger.info("Secret '%s' stored securely", qualified_name)
+    
+    def set_api_keys_bulk(self, api_keys: Dict[str, str]) -> None:
+        """
+        Store API keys for several providers with a single write.
         
-        try:
-            qualified_name = self._get_key_name(key_name)
-            secrets = self._load_secrets()
-            secrets[qualified_name] = value.strip()
-            self._save_secrets(secrets)
-            logger.info(f"Secret '{qualified_name}' stored securely")
-        except Exception as e:
-            raise SecretsManagerError(
-                f"Failed to store secret '{key_name}': {str(e)}"
-            ) from e
-        finally:
-            self.project = old_project
+        All keys are validated as in set_api_key(); if any is rejected,
+        none of them are stored.
+        
+        Args:
+            api_keys: Mapping of provider name to API key
+            
+        Raises:
+            ValueError: If a provider is not supported or a key is empty
+            SecretsManagerError: If storing the keys fails
+            
+        Examples:
+            >>> manager = SecretsManager()
+            >>> manager.set_api_keys_bulk({"openai": "sk-proj-...", "anthropic": "sk-ant-..."})
+        """
+        with self.batch():
+            for provider, api_key in api_keys.items():
+                self.set_api_key(provider, api_key)
+    
+    def set_secrets_bulk(self, secrets: Dict[str, str], project: Optional[str] = None) -> None:
+        """
+        Store several generic secrets with a single write.
+        
+        All secrets are validated as in set_secret(); if any is rejected,
+        none of them are stored.
+        
+        Args:
+            secrets: Mapping of secret name to value
+            project: Optional project name for scoping
+            
+        Raises:
+            ValueError: If a key name or value is empty
+            SecretsManagerError: If storing the secrets fails
+            
+        Examples:
+            >>> manager = SecretsManager()
+            >>> manager.set_secrets_bulk(
+            ...     {"DATABASE_URL": "postgres://...", "REDIS_URL": "redis://..."},
+            ...     project="my-app"
+            ... )
+        """
+        with self.batch():
+            for key_name, value in secrets.items():
+                self.set_secret(key_name, value, project=project)
     
     def get_secret(self, key_name: str, project: Optional[str] = None) -> Optional[str]:
         """
@@ -261,25 +455,13 @@ class SecretsManager:
             >>> manager = SecretsManager()
             >>> password = manager.get_secret("db_password", project="my-app")
         """
-        # Temporarily override project if specified
-        old_project = self.project
-        if project:
-            self.project = project
-        
-        try:
-            qualified_name = self._get_key_name(key_name)
-            secrets = self._load_secrets()
-            secret = secrets.get(qualified_name)
-            if secret:
-                logger.debug(f"Retrieved secret '{qualified_name}'")
-                return secret
-            return None
-        except Exception as e:
-            raise SecretsManagerError(
-                f"Failed to retrieve secret '{key_name}': {str(e)}"
-            ) from e
-        finally:
-            self.project = old_project
+        qualified_name = self._get_key_name(key_name, project=project)
+        secrets = self._load_secrets()
+        secret = secrets.get(qualified_name)
+        if secret:
+            logger.debug("Retrieved secret '%s'", qualified_name)
+            return secret
+        return None
     
     def delete_secret(self, key_name: str, project: Optional[str] = None) -> None:
         """
@@ -293,28 +475,16 @@ class SecretsManager:
             >>> manager = SecretsManager()
             >>> manager.delete_secret("db_password", project="my-app")
         """
-        # Temporarily override project if specified
-        old_project = self.project
-        if project:
-            self.project = project
+        qualified_name = self._get_key_name(key_name, project=project)
+        secrets = self._load_secrets_for_update()
         
-        try:
-            qualified_name = self._get_key_name(key_name)
-            secrets = self._load_secrets()
-            
-            if qualified_name not in secrets:
-                logger.warning(f"No secret found: '{qualified_name}'")
-                return
-            
-            del secrets[qualified_name]
-            self._save_secrets(secrets)
-            logger.info(f"Secret '{qualified_name}' deleted")
-        except Exception as e:
-            raise SecretsManagerError(
-                f"Failed to delete secret '{key_name}': {str(e)}"
-            ) from e
-        finally:
-            self.project = old_project
+        if qualified_name not in secrets:
+            logger.warning("No secret found: '%s'", qualified_name)
+            return
+        
+        del secrets[qualified_name]
+        self._save_secrets(secrets)
+        logger.info("Secret '%s' deleted", qualified_name)
     
     def get_api_key(self, provider: str) -> Optional[str]:
         """
@@ -335,17 +505,12 @@ class SecretsManager:
             >>> if api_key:
             ...     print("Key found!")
         """
-        try:
-            secrets = self._load_secrets()
-            api_key = secrets.get(provider)
-            if api_key:
-                logger.debug(f"Retrieved API key for provider '{provider}'")
-                return api_key
-            return None
-        except Exception as e:
-            raise SecretsManagerError(
-                f"Failed to retrieve API key for provider '{provider}': {str(e)}"
-            ) from e
+        secrets = self._load_secrets()
+        api_key = secrets.get(provider)
+        if api_key:
+            logger.debug("Retrieved API key for provider '%s'", provider)
+            return api_key
+        return None
     
     def delete_api_key(self, provider: str) -> None:
         """
@@ -361,20 +526,15 @@ class SecretsManager:
             >>> manager = SecretsManager()
             >>> manager.delete_api_key("openai")
         """
-        try:
-            secrets = self._load_secrets()
-            
-            if provider not in secrets:
-                logger.warning(f"No API key found for provider '{provider}'")
-                return
-            
-            del secrets[provider]
-            self._save_secrets(secrets)
-            logger.info(f"API key for provider '{provider}' deleted")
-        except Exception as e:
-            raise SecretsManagerError(
-                f"Failed to delete API key for provider '{provider}': {str(e)}"
-            ) from e
+        secrets = self._load_secrets_for_update()
+        
+        if provider not in secrets:
+            logger.warning("No API key found for provider '%s'", provider)
+            return
+        
+        del secrets[provider]
+        self._save_secrets(secrets)
+        logger.info("API key for provider '%s' deleted", provider)
     
     def list_configured_providers(self) -> List[str]:
         """
@@ -388,14 +548,7 @@ class SecretsManager:
             >>> providers = manager.list_configured_providers()
             >>> print(f"Configured: {', '.join(providers)}")
         """
-        configured = []
-        secrets = self._load_secrets()
-        
-        for provider in self.SUPPORTED_PROVIDERS:
-            if provider in secrets:
-                configured.append(provider)
-        
-        return configured
+        return sorted(self._load_secrets().keys() & self.SUPPORTED_PROVIDERS)
     
     def has_api_key(self, provider: str) -> bool:
         """
@@ -413,7 +566,7 @@ class SecretsManager:
             ...     print("OpenAI key is configured")
         """
         try:
-            return self.get_api_key(provider) is not None
+            return bool(self._load_secrets().get(provider))
         except SecretsManagerError:
             return False
     
@@ -465,35 +618,27 @@ class SecretsManager:
             >>> print(app_secrets['secrets']['my-app'])
         """
         secrets = self._load_secrets()
+        supported = self.SUPPORTED_PROVIDERS
         providers = []
         project_secrets: Dict[str, List[str]] = {}
         
-        for key, value in secrets.items():
-            if self.is_provider_key(key):
+        for key in secrets:
+            if key in supported:
                 # This is a provider API key
                 providers.append(key)
-            elif "::" in key:
-                # This is a project-scoped secret
-                proj_name, secret_name = key.split("::", 1)
-                
-                # Apply project filter if specified
-                if project and proj_name != project:
-                    continue
-                
-                if proj_name not in project_secrets:
-                    project_secrets[proj_name] = []
-                project_secrets[proj_name].append(secret_name)
-            else:
+                continue
+            
+            # Project-scoped secrets are stored as "<project>::<name>"
+            proj_name, sep, secret_name = key.partition("::")
+            if not sep:
                 # This is a non-scoped secret (treat as "default" project)
-                proj_name = "default"
-                
-                # Apply project filter if specified
-                if project and proj_name != project:
-                    continue
-                
-                if proj_name not in project_secrets:
-                    project_secrets[proj_name] = []
-                project_secrets[proj_name].append(key)
+                proj_name, secret_name = "default", key
+            
+            # Apply project filter if specified
+            if project and proj_name != project:
+                continue
+            
+            project_secrets.setdefault(proj_name, []).append(secret_name)
         
         return {
             "providers": sorted(providers),
@@ -527,22 +672,23 @@ class SecretsManager:
             project = "default"
         
         secrets = self._load_secrets()
+        env_vars = self.PROVIDER_ENV_VARS
         result = {}
         
         for key, value in secrets.items():
-            if self.is_provider_key(key):
+            if key in env_vars:
                 if include_providers:
                     # Convert provider key to env var format (e.g., openai -> OPENAI_API_KEY)
-                    env_var_name = f"{key.upper()}_API_KEY"
-                    result[env_var_name] = value
-            elif "::" in key:
+                    result[env_vars[key]] = value
+                continue
+            
+            proj_name, sep, secret_name = key.partition("::")
+            if sep:
                 # Project-scoped secret
-                proj_name, secret_name = key.split("::", 1)
                 if proj_name == project:
                     result[secret_name] = value
-            else:
+            elif project == "default":
                 # Non-scoped secret (belongs to "default" project)
-                if project == "default":
-                    result[key] = value
+                result[key] = value
         
         return result
\ No newline at end of file
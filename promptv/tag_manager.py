@@ -1,10 +1,12 @@
 """
 Tag management for promptv - Git-like tag/label system.
 """
-import json
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 from promptv.models import Tag, TagRegistry
 from promptv.exceptions import PromptNotFoundError, TagNotFoundError, TagAlreadyExistsError
 
@@ -12,6 +14,9 @@ from promptv.exceptions import PromptNotFoundError, TagNotFoundError, TagAlready
 class TagManager:
     """Manages tags/labels for prompt versions."""
     
+    # Maximum number of parsed registries kept in memory
+    REGISTRY_CACHE_SIZE = 256
+    
     def __init__(self, prompts_dir: Path):
         """
         Initialize the TagManager.
@@ -20,6 +25,9 @@ class TagManager:
             prompts_dir: Path to the prompts directory
         """
         self.prompts_dir = prompts_dir
+        # (prompt_name, project) -> ((mtime_ns, size) of tags.json, parsed registry)
+        # kept in least-recently-used order
+        self._registry_cache: OrderedDict = OrderedDict()
     
     def _get_tags_file(self, prompt_name: str, project: Optional[str] = None) -> Path:
         """Get the path to tags.json for a prompt."""
@@ -39,27 +47,44 @@ class TagManager:
             TagRegistry object
         """
         tags_file = self._get_tags_file(prompt_name, project=project)
+        cache_key = (prompt_name, project)
         
-        if not tags_file.exists():
+        try:
+            st = tags_file.stat()
+        except FileNotFoundError:
             # No tags yet - return empty registry
+            self._registry_cache.pop(cache_key, None)
             return TagRegistry(prompt_name=prompt_name, tags={})
         
+        file_key = (st.st_mtime_ns, st.st_size)
+        cached = self._registry_cache.get(cache_key)
+        if cached is not None and cached[0] == file_key:
+            self._registry_cache.move_to_end(cache_key)
+            return cached[1]
+        
         try:
-            with open(tags_file, 'r') as f:
-                data = json.load(f)
-            
-            # Convert timestamp strings to datetime objects
-            for tag_data in data.get("tags", {}).values():
-                if isinstance(tag_data.get("created_at"), str):
-                    tag_data["created_at"] = datetime.fromisoformat(tag_data["created_at"])
-                if isinstance(tag_data.get("updated_at"), str):
-                    tag_data["updated_at"] = datetime.fromisoformat(tag_data["updated_at"])
-            
-            return TagRegistry(**data)
+            # Parse and validate in one pass with pydantic-core's JSON parser;
+            # ISO timestamp strings are converted to datetime by the model
+            registry = TagRegistry.model_validate_json(tags_file.read_bytes())
             
         except Exception as e:
             # If there's an error, return empty registry
             return TagRegistry(prompt_name=prompt_name, tags={})
+        
+        self._cache_registry(cache_key, file_key, registry)
+        return registry
+    
+    def _cache_registry(
+        self,
+        cache_key: Tuple[str, Optional[str]],
+        file_key: Tuple[int, int],
+        registry: TagRegistry
+    ):
+        """Store a parsed registry, evicting the least recently used entry."""
+        self._registry_cache[cache_key] = (file_key, registry)
+        self._registry_cache.move_to_end(cache_key)
+        if len(self._registry_cache) > self.REGISTRY_CACHE_SIZE:
+            self._registry_cache.popitem(last=False)
     
     def _save_tags(self, registry: TagRegistry, project: Optional[str] = None):
         """
@@ -72,18 +97,28 @@ class TagManager:
         tags_file = self._get_tags_file(registry.prompt_name, project=project)
         tags_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # Convert to dict
-        data = registry.model_dump(mode='json')
+        # Serialize in pydantic-core (compact JSON, ISO timestamps)
+        data = registry.model_dump_json()
         
-        # Convert datetime objects to ISO format strings
-        for tag_data in data.get("tags", {}).values():
-            if "created_at" in tag_data:
-                tag_data["created_at"] = tag_data["created_at"]
-            if "updated_at" in tag_data:
-                tag_data["updated_at"] = tag_data["updated_at"]
+        # Write to a temp file, fsync it and rename it into place so a crash
+        # never leaves a truncated or empty tags.json behind
+        tmp_file = tags_file.with_name(
+            f".{tags_file.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, tags_file)
+        except BaseException:
+            tmp_file.unlink(missing_ok=True)
+            raise
         
-        with open(tags_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        st = tags_file.stat()
+        self._cache_registry(
+            (registry.prompt_name, project), (st.st_mtime_ns, st.st_size), registry
+        )
     
     def create_tag(
         self,
@@ -112,26 +147,97 @@ class TagManager:
             PromptNotFoundError: If the prompt doesn't exist
             TagAlreadyExistsError: If tag exists and allow_update is False
         """
-        # Check if prompt exists
-        prompt_dir = self.prompts_dir / prompt_name if not project else self.prompts_dir / project / prompt_name
-        if not prompt_dir.exists():
-            raise PromptNotFoundError(prompt_name)
+        registry = self._load_registry_for_update(prompt_name, project=project)
+        tag = self._apply_tag(
+            registry, prompt_name, tag_name, version, description, allow_update, datetime.now()
+        )
+        
+        # Save changes
+        self._save_tags(registry, project=project)
+        
+        return tag
+    
+    def create_tags(
+        self,
+        prompt_name: str,
+        tags: Dict[str, int],
+        allow_update: bool = False,
+        project: Optional[str] = None
+    ) -> Dict[str, Tag]:
+        """
+        Create or update several tags on one prompt, writing tags.json once.
+        
+        Equivalent to calling create_tag() for each entry, but the registry
+        is loaded and saved a single time. Nothing is written if any tag
+        fails validation.
+        
+        Args:
+            prompt_name: Name of the prompt
+            tags: Mapping of tag name to the version it should point to
+            allow_update: If True, allow updating existing tags
+            project: Optional project name
+            
+        Returns:
+            Dictionary mapping tag names to the created/updated Tag objects
+            
+        Raises:
+            PromptNotFoundError: If the prompt doesn't exist
+            TagAlreadyExistsError: If a tag exists and allow_update is False
+        """
+        registry = self._load_registry_for_update(prompt_name, project=project)
+        now = datetime.now()
+        created = {
+            tag_name: self._apply_tag(
+                registry, prompt_name, tag_name, version, None, allow_update, now
+            )
+            for tag_name, version in tags.items()
+        }
+        
+        self._save_tags(registry, project=project)
+        
+        return created
+    
+    def _load_registry_for_update(self, prompt_name: str, project: Optional[str] = None) -> TagRegistry:
+        """
+        Load a private, mutable copy of a prompt's tag registry.
         
+        Raises:
+            PromptNotFoundError: If the prompt doesn't exist
+        """
         # Load existing tags
         registry = self._load_tags(prompt_name, project=project)
         
+        # Check if prompt exists. A cached registry means _load_tags just
+        # stat'ed tags.json inside the prompt directory, so skip the extra stat.
+        if (prompt_name, project) not in self._registry_cache:
+            prompt_dir = self.prompts_dir / prompt_name if not project else self.prompts_dir / project / prompt_name
+            if not prompt_dir.exists():
+                raise PromptNotFoundError(prompt_name)
+        
+        # Copy, since the cached registry is shared
+        return registry.model_copy(update={"tags": dict(registry.tags)})
+    
+    def _apply_tag(
+        self,
+        registry: TagRegistry,
+        prompt_name: str,
+        tag_name: str,
+        version: int,
+        description: Optional[str],
+        allow_update: bool,
+        now: datetime
+    ) -> Tag:
+        """Create or update one tag in a registry copy (not saved)."""
         # Check if tag already exists
-        now = datetime.now()
         if tag_name in registry.tags:
             if not allow_update:
                 raise TagAlreadyExistsError(tag_name, prompt_name)
             
             # Update existing tag
-            tag = registry.tags[tag_name]
-            tag.version = version
-            tag.updated_at = now
+            changes = {"version": version, "updated_at": now}
             if description is not None:
-                tag.description = description
+                changes["description"] = description
+            tag = registry.tags[tag_name].model_copy(update=changes)
         else:
             # Create new tag
             tag = Tag(
@@ -141,10 +247,7 @@ class TagManager:
                 updated_at=now,
                 description=description
             )
-            registry.tags[tag_name] = tag
-        
-        # Save changes
-        self._save_tags(registry, project=project)
+        registry.tags[tag_name] = tag
         
         return tag
     
@@ -175,7 +278,7 @@ class TagManager:
             Dictionary of tag_name -> Tag
         """
         registry = self._load_tags(prompt_name, project=project)
-        return registry.tags
+        return dict(registry.tags)
     
     def delete_tag(self, prompt_name: str, tag_name: str, project: Optional[str] = None) -> bool:
         """
@@ -197,7 +300,8 @@ class TagManager:
         if tag_name not in registry.tags:
             raise TagNotFoundError(tag_name, prompt_name)
         
-        # Remove the tag
+        # Remove the tag (from a copy, since the cached registry is shared)
+        registry = registry.model_copy(update={"tags": dict(registry.tags)})
         del registry.tags[tag_name]
         
         # Save changes
@@ -234,21 +338,14 @@ class TagManager:
         if ref == "latest":
             return max_version
         
-        # Try to parse as integer (direct version number)
-        is_number = False
-        try:
+        # Direct version number (checked up front so tag names don't pay
+        # for a failed int() conversion)
+        if ref.isascii() and ref.isdigit():
             version = int(ref)
-            is_number = True
             # Validate version is in range
             if 1 <= version <= max_version:
                 return version
-            else:
-                raise ValueError(f"Version {version} is out of range (1-{max_version})")
-        except ValueError as e:
-            if is_number:
-                # It was a number but out of range - re-raise ValueError
-                raise
-            # Not a number, try as tag
+            raise ValueError(f"Version {version} is out of range (1-{max_version})")
         
         # Try to resolve as tag
         tag = self.get_tag(prompt_name, ref, project=project)
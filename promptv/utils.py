@@ -1,9 +1,10 @@
 """
 Utility functions for promptv CLI.
 """
-from typing import Dict
-from urllib.parse import urlparse
-from rich.console import Console
+import re
+import sys
+from typing import Dict, Optional, TextIO, Tuple
+from rich.console import Console, Group
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
@@ -11,6 +12,31 @@ from rich.text import Text
 from promptv.models import CostEstimate
 
 
+# Console for the stream sys.stdout pointed at when it was built. Rich detects
+# the terminal and colour support once per Console, so a new one is built
+# whenever sys.stdout is swapped (click's CliRunner, redirect_stdout, ...).
+# The repr highlighter is only used for a terminal; elsewhere its styling is
+# dropped or, with FORCE_COLOR, splits numbers like "1,234" into spans.
+_console_cache: Tuple[Optional[TextIO], Optional[Console]] = (None, None)
+
+
+def _get_console() -> Console:
+    """Return a Console bound to the current sys.stdout."""
+    global _console_cache
+    stream, console = _console_cache
+    if console is None or stream is not sys.stdout:
+        console = Console(file=sys.stdout, highlight=sys.stdout.isatty())
+        _console_cache = (sys.stdout, console)
+    return console
+
+
+# http(s) scheme followed by a non-empty host part
+_URL_RE = re.compile(r'^https?://[^/\s?#]+', re.IGNORECASE)
+
+# Markup for format_token_count: provider, model, token count
+_TOKEN_FMT = "[cyan]{}/{}[/cyan]: [bold green]{:,}[/bold green] tokens".format
+
+
 def is_valid_url(url: str) -> bool:
     """
     Validate if a string is a valid URL.
@@ -22,12 +48,31 @@ def is_valid_url(url: str) -> bool:
         True if valid URL, False otherwise
     """
     try:
-        result = urlparse(url)
-        return all([result.scheme, result.netloc]) and result.scheme in ['http', 'https']
-    except Exception:
+        return _URL_RE.match(url) is not None
+    except TypeError:
         return False
 
 
+def _build_cost_estimate_table(cost: CostEstimate) -> Table:
+    """Build the detailed cost breakdown table for a single estimate."""
+    table = Table(title="Cost Estimate", show_header=True, header_style="bold cyan")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="green", justify="right")
+    
+    # Add rows
+    table.add_row("Provider", cost.provider)
+    table.add_row("Model", cost.model)
+    table.add_row("", "")  # Spacer
+    table.add_row("Input Tokens", f"{cost.input_tokens:,}")
+    table.add_row("Estimated Output Tokens", f"{cost.estimated_output_tokens:,}")
+    table.add_row("Total Tokens", f"{cost.total_tokens:,}", style="bold")
+    table.add_row("", "")  # Spacer
+    table.add_row("Input Cost", f"${cost.input_cost:.6f}")
+    table.add_row("Estimated Output Cost", f"${cost.estimated_output_cost:.6f}")
+    table.add_row("Total Cost", f"${cost.total_cost:.6f}", style="bold green")
+    return table
+
+
 def format_cost_estimate(cost: CostEstimate, show_detail: bool = True) -> None:
     """
     Display a formatted cost estimate using Rich.
@@ -36,27 +81,10 @@ def format_cost_estimate(cost: CostEstimate, show_detail: bool = True) -> None:
         cost: CostEstimate object to format
         show_detail: Whether to show detailed breakdown (default: True)
     """
-    console = Console()
+    console = _get_console()
     
     if show_detail:
-        # Create detailed table
-        table = Table(title="Cost Estimate", show_header=True, header_style="bold cyan")
-        table.add_column("Metric", style="cyan")
-        table.add_column("Value", style="green", justify="right")
-        
-        # Add rows
-        table.add_row("Provider", cost.provider)
-        table.add_row("Model", cost.model)
-        table.add_row("", "")  # Spacer
-        table.add_row("Input Tokens", f"{cost.input_tokens:,}")
-        table.add_row("Estimated Output Tokens", f"{cost.estimated_output_tokens:,}")
-        table.add_row("Total Tokens", f"{cost.total_tokens:,}", style="bold")
-        table.add_row("", "")  # Spacer
-        table.add_row("Input Cost", f"${cost.input_cost:.6f}")
-        table.add_row("Estimated Output Cost", f"${cost.estimated_output_cost:.6f}")
-        table.add_row("Total Cost", f"${cost.total_cost:.6f}", style="bold green")
-        
-        console.print(table)
+        console.print(_build_cost_estimate_table(cost))
     else:
         # Simple one-line output
         console.print(
@@ -66,14 +94,31 @@ def format_cost_estimate(cost: CostEstimate, show_detail: bool = True) -> None:
         )
 
 
-def format_cost_comparison(comparisons: Dict[str, CostEstimate]) -> None:
+def format_cost_comparison(comparisons: Dict[str, CostEstimate], plain: bool = False) -> None:
     """
     Display a comparison table of costs across multiple models.
     
     Args:
         comparisons: Dictionary mapping "provider/model" to CostEstimate
+        plain: Write an unstyled, space-aligned table to stdout instead of
+            a Rich table (for scripts and piped output)
     """
-    console = Console()
+    console = _get_console()
+    
+    # Split estimates from failed models in one pass, then sort by total
+    # cost (cheapest first)
+    sorted_comparisons = []
+    failed = []
+    for key, cost in comparisons.items():
+        if cost is None:
+            failed.append(key)
+        else:
+            sorted_comparisons.append((key, cost))
+    sorted_comparisons.sort(key=lambda x: x[1].total_cost)
+    
+    if plain:
+        _write_plain_cost_comparison(sorted_comparisons, failed)
+        return
     
     # Create comparison table
     table = Table(
@@ -90,46 +135,91 @@ def format_cost_comparison(comparisons: Dict[str, CostEstimate]) -> None:
     table.add_column("Output Cost", justify="right")
     table.add_column("Total Cost", justify="right", style="bold green")
     
-    # Sort by total cost (cheapest first)
-    sorted_comparisons = sorted(
-        [(k, v) for k, v in comparisons.items() if v is not None],
-        key=lambda x: x[1].total_cost
-    )
-    
-    # Add rows
+    # Add rows (formatters bound once outside the loop)
+    fmt_int = "{:,}".format
+    fmt_usd = "${:.6f}".format
+    add_row = table.add_row
     for key, cost in sorted_comparisons:
-        table.add_row(
+        add_row(
             key,
-            f"{cost.input_tokens:,}",
-            f"{cost.estimated_output_tokens:,}",
-            f"{cost.total_tokens:,}",
-            f"${cost.input_cost:.6f}",
-            f"${cost.estimated_output_cost:.6f}",
-            f"${cost.total_cost:.6f}"
+            fmt_int(cost.input_tokens),
+            fmt_int(cost.estimated_output_tokens),
+            fmt_int(cost.total_tokens),
+            fmt_usd(cost.input_cost),
+            fmt_usd(cost.estimated_output_cost),
+            fmt_usd(cost.total_cost)
         )
     
+    # Collect everything into one renderable so it is written in one print
+    renderables = []
+    
     # Add failed models if any
-    failed = [k for k, v in comparisons.items() if v is None]
     if failed:
-        console.print()
-        console.print("[yellow]Warning:[/yellow] Could not estimate cost for:", style="yellow")
+        renderables.append(Text())
+        renderables.append(
+            Text.from_markup("[yellow]Warning:[/yellow] Could not estimate cost for:", style="yellow")
+        )
         for model in failed:
-            console.print(f"  - {model}", style="dim")
-        console.print()
+            renderables.append(Text.from_markup(f"  - {model}", style="dim"))
+        renderables.append(Text())
     
-    console.print(table)
+    renderables.append(table)
     
     # Highlight cheapest option
     if sorted_comparisons:
         cheapest_key, cheapest_cost = sorted_comparisons[0]
-        console.print()
-        console.print(
+        renderables.append(Text())
+        renderables.append(
             Panel(
                 f"[bold green]Cheapest option:[/bold green] {cheapest_key} "
                 f"at ${cheapest_cost.total_cost:.6f}",
                 border_style="green"
             )
         )
+    
+    console.print(Group(*renderables))
+
+
+def _write_plain_cost_comparison(sorted_comparisons, failed) -> None:
+    """Write a cost comparison as a plain, column-aligned text block."""
+    fmt_int = "{:,}".format
+    fmt_usd = "${:.6f}".format
+    rows = [(
+        "Provider/Model", "Input Tokens", "Output Tokens", "Total Tokens",
+        "Input Cost", "Output Cost", "Total Cost"
+    )]
+    for key, cost in sorted_comparisons:
+        rows.append((
+            key,
+            fmt_int(cost.input_tokens),
+            fmt_int(cost.estimated_output_tokens),
+            fmt_int(cost.total_tokens),
+            fmt_usd(cost.input_cost),
+            fmt_usd(cost.estimated_output_cost),
+            fmt_usd(cost.total_cost)
+        ))
+    widths = [max(map(len, column)) for column in zip(*rows)]
+    
+    def render_row(row):
+        # Model names left-aligned, numbers right-aligned
+        cells = [row[0].ljust(widths[0])]
+        cells.extend(cell.rjust(width) for cell, width in zip(row[1:], widths[1:]))
+        return "  ".join(cells).rstrip()
+    
+    lines = []
+    if failed:
+        lines.append("Warning: Could not estimate cost for:")
+        lines.extend(f"  - {model}" for model in failed)
+        lines.append("")
+    lines.append(render_row(rows[0]))
+    lines.append("  ".join("-" * width for width in widths))
+    lines.extend(render_row(row) for row in rows[1:])
+    if sorted_comparisons:
+        cheapest_key, cheapest_cost = sorted_comparisons[0]
+        lines.append("")
+        lines.append(f"Cheapest option: {cheapest_key} at ${cheapest_cost.total_cost:.6f}")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def format_token_count(tokens: int, model: str, provider: str) -> None:
@@ -141,10 +231,7 @@ def format_token_count(tokens: int, model: str, provider: str) -> None:
         model: Model name
         provider: Provider name
     """
-    console = Console()
-    console.print(
-        f"[cyan]{provider}/{model}[/cyan]: [bold green]{tokens:,}[/bold green] tokens"
-    )
+    _get_console().print(_TOKEN_FMT(provider, model, tokens))
 
 
 def confirm_cost(cost: CostEstimate, threshold: float = 0.10) -> bool:
@@ -156,27 +243,33 @@ def confirm_cost(cost: CostEstimate, threshold: float = 0.10) -> bool:
         threshold: Cost threshold in USD (default: $0.10)
     
     Returns:
-        True if user confirms or cost is below threshold, False otherwise
+        True if user confirms or cost is below threshold, False otherwise.
+        Without an interactive stdin there is nobody to confirm, so costs
+        above the threshold are declined without rendering the prompt.
     """
     if cost.total_cost < threshold:
         return True
     
-    console = Console()
+    if not sys.stdin.isatty():
+        return False
+    
+    console = _get_console()
     
     # Display cost estimate
-    console.print()
     console.print(
-        Panel(
-            f"[yellow]Warning:[/yellow] Estimated cost is [bold]${cost.total_cost:.6f}[/bold]\n"
-            f"This exceeds the threshold of ${threshold:.2f}",
-            title="Cost Confirmation Required",
-            border_style="yellow"
+        Group(
+            Text(),
+            Panel(
+                f"[yellow]Warning:[/yellow] Estimated cost is [bold]${cost.total_cost:.6f}[/bold]\n"
+                f"This exceeds the threshold of ${threshold:.2f}",
+                title="Cost Confirmation Required",
+                border_style="yellow"
+            ),
+            _build_cost_estimate_table(cost),
+            Text(),
         )
     )
     
-    format_cost_estimate(cost, show_detail=True)
-    console.print()
-    
     # Prompt for confirmation
     response = console.input("[yellow]Continue?[/yellow] (y/N): ")
     return response.lower() in ('y', 'yes')
@@ -190,7 +283,7 @@ def format_error(error_message: str, suggestion: str = None) -> None:
         error_message: Error message to display
         suggestion: Optional suggestion for fixing the error
     """
-    console = Console()
+    console = _get_console()
     
     content = f"[bold red]Error:[/bold red] {error_message}"
     if suggestion:
@@ -206,5 +299,5 @@ def format_success(message: str) -> None:
     Args:
         message: Success message to display
     """
-    console = Console()
+    console = _get_console()
     console.print(f"[bold green]✓[/bold green] {message}")
\ No newline at end of file
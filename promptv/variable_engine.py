@@ -1,6 +1,7 @@
 """
 Jinja2-powered variable engine for template interpolation.
 """
+from functools import lru_cache
 from jinja2 import Environment, Template, meta, UndefinedError, StrictUndefined
 from typing import List, Dict, Any, Tuple
 
@@ -8,9 +9,19 @@ from typing import List, Dict, Any, Tuple
 class VariableEngine:
     """Engine for extracting and rendering Jinja2 template variables."""
     
+    # Number of distinct templates whose parse/compile results are memoized
+    CACHE_SIZE = 256
+    
     def __init__(self):
         """Initialize the variable engine with Jinja2 environment."""
         self.env = Environment(undefined=StrictUndefined)
+        self._parse_cached = lru_cache(maxsize=self.CACHE_SIZE)(self._parse_variables)
+        self._compile_cached = lru_cache(maxsize=self.CACHE_SIZE)(self.env.from_string)
+    
+    def _parse_variables(self, template_str: str) -> Tuple[str, ...]:
+        """Parse a template and return its undeclared variables, sorted."""
+        ast = self.env.parse(template_str)
+        return tuple(sorted(meta.find_undeclared_variables(ast)))
     
     def extract_variables(self, template_str: str) -> List[str]:
         """
@@ -28,13 +39,39 @@ class VariableEngine:
             ['count', 'name']
         """
         try:
-            ast = self.env.parse(template_str)
-            variables = meta.find_undeclared_variables(ast)
-            return sorted(variables)
+            return list(self._parse_cached(template_str))
         except Exception:
             # If parsing fails, return empty list
             return []
     
+    def prepare(self, template_str: str) -> Tuple[List[str], Template]:
+        """
+        Extract a template's variables and compile it in one call.
+        
+        Callers that validate and then render the same template can use the
+        returned Template directly instead of going through render().
+        
+        Args:
+            template_str: The template string to prepare
+            
+        Returns:
+            Tuple of (variables, template)
+            - variables: Sorted list of unique variable names
+            - template: Compiled Jinja2 Template
+            
+        Raises:
+            TemplateSyntaxError: If the template cannot be parsed
+            
+        Example:
+            >>> engine = VariableEngine()
+            >>> variables, template = engine.prepare("Hello {{name}}!")
+            >>> variables
+            ['name']
+            >>> template.render(name="World")
+            'Hello World!'
+        """
+        return list(self._parse_cached(template_str)), self._compile_cached(template_str)
+    
     def render(self, template_str: str, variables: Dict[str, Any]) -> str:
         """
         Render a template with provided variables.
@@ -54,7 +91,12 @@ class VariableEngine:
             >>> engine.render("Hello {{name}}!", {"name": "World"})
             'Hello World!'
         """
-        template = self.env.from_string(template_str)
+        if "{" not in template_str and "\r" not in template_str:
+            # No Jinja delimiters, so nothing to substitute. Match Jinja's
+            # output, which drops a single trailing newline.
+            return template_str[:-1] if template_str.endswith("\n") else template_str
+        
+        template = self._compile_cached(template_str)
         return template.render(**variables)
     
     def validate_variables(self, template_str: str, variables: Dict[str, Any]) -> Tuple[bool, List[str]]:
@@ -79,5 +121,31 @@ class VariableEngine:
             (True, [])
         """
         required = self.extract_variables(template_str)
+        return self.validate_variables_against(required, variables)
+    
+    def validate_variables_against(
+        self,
+        required: List[str],
+        variables: Dict[str, Any]
+    ) -> Tuple[bool, List[str]]:
+        """
+        Check provided variables against an already-extracted variable list.
+        
+        Use this instead of validate_variables when the template's variables
+        are already known (e.g. from extract_variables or version metadata),
+        so the template is not parsed again.
+        
+        Args:
+            required: Variable names the template needs
+            variables: Dictionary of variable names to values
+            
+        Returns:
+            Tuple of (is_valid, missing_variables)
+            
+        Example:
+            >>> engine = VariableEngine()
+            >>> engine.validate_variables_against(['count', 'name'], {"name": "Alice"})
+            (False, ['count'])
+        """
         missing = [v for v in required if v not in variables]
-        return len(missing) == 0, missing
\ No newline at end of file
+        return not missing, missing
\ No newline at end of file
@@ -2,26 +2,53 @@
 Shared test fixtures and configuration for promptv tests.
 """
 import pytest
-import tempfile
 import shutil
 from pathlib import Path
-from promptv.manager import PromptManager
+from click.testing import CliRunner
+
+
+@pytest.fixture(scope="session")
+def runner():
+    """
+    Create a Click CLI runner (stateless, so shared by the whole session).
+    
+    Unexpected exceptions propagate instead of being captured into
+    result.exception, which no test inspects; the commands' own
+    sys.exit() calls still just set result.exit_code.
+    """
+    return CliRunner(catch_exceptions=False)
 
 
 @pytest.fixture
-def temp_home(monkeypatch):
+def temp_home(tmp_path, monkeypatch):
     """Create a temporary home directory for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        temp_path = Path(tmpdir)
-        monkeypatch.setenv("HOME", str(temp_path))
-        # Also patch Path.home() to return our temp directory
-        monkeypatch.setattr(Path, "home", lambda: temp_path)
-        yield temp_path
+    monkeypatch.setenv("HOME", str(tmp_path))
+    # Also patch Path.home() to return our temp directory
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    return tmp_path
+
+
+@pytest.fixture(scope="session")
+def golden_home(tmp_path_factory):
+    """Build an initialized ~/.promptv tree once per test session."""
+    from promptv.manager import PromptManager
+    
+    home = tmp_path_factory.mktemp("golden")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("HOME", str(home))
+        mp.setattr(Path, "home", lambda: home)
+        PromptManager()
+    return home / ".promptv"
 
 
 @pytest.fixture
-def prompt_manager(temp_home):
+def prompt_manager(temp_home, golden_home):
     """Create a PromptManager instance with temporary home directory."""
+    from promptv.manager import PromptManager
+    
+    # Start from a copy of the session's initialized tree instead of
+    # regenerating config files for every test
+    shutil.copytree(golden_home, temp_home / ".promptv")
     return PromptManager()
 
 
@@ -46,13 +73,14 @@ def sample_prompts(prompt_manager, sample_prompt_content):
     """Create some sample prompts for testing."""
     prompts = {}
     
-    # Create first prompt with 2 versions
-    result1 = prompt_manager.set_prompt("test-prompt-1", sample_prompt_content)
-    result2 = prompt_manager.set_prompt("test-prompt-1", sample_prompt_content + "\nVersion 2")
+    # First prompt gets 2 versions, second prompt 1; each prompt's
+    # metadata is written once
+    result1, result2, result3 = prompt_manager.bulk_set_prompts([
+        ("test-prompt-1", sample_prompt_content, None, None),
+        ("test-prompt-1", sample_prompt_content + "\nVersion 2", None, None),
+        ("test-prompt-2", "Another prompt", None, None),
+    ])
     prompts["test-prompt-1"] = [result1, result2]
-    
-    # Create second prompt with 1 version
-    result3 = prompt_manager.set_prompt("test-prompt-2", "Another prompt")
     prompts["test-prompt-2"] = [result3]
     
     return prompts
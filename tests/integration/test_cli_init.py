@@ -2,27 +2,10 @@
 Integration tests for promptv init command.
 """
 
+import os
 import pytest
-import tempfile
-import shutil
-from pathlib import Path
-from click.testing import CliRunner
 from promptv.cli import cli
-
-
-@pytest.fixture
-def runner():
-    """Create a Click CLI runner."""
-    return CliRunner()
-
-
-@pytest.fixture
-def temp_home(monkeypatch):
-    """Create a temporary home directory."""
-    temp_dir = Path(tempfile.mkdtemp())
-    monkeypatch.setenv("HOME", str(temp_dir))
-    yield temp_dir
-    shutil.rmtree(temp_dir)
+from promptv.resources import safe_load_yaml
 
 
 class TestInitCommand:
@@ -123,12 +106,10 @@ class TestInitCommand:
         secrets_file = secrets_dir / "secrets.json"
         
         # Check directory permissions (0700)
-        dir_mode = oct(secrets_dir.stat().st_mode)[-3:]
-        assert dir_mode == "700"
+        assert secrets_dir.stat().st_mode & 0o777 == 0o700
         
         # Check file permissions (0600)
-        file_mode = oct(secrets_file.stat().st_mode)[-3:]
-        assert file_mode == "600"
+        assert secrets_file.stat().st_mode & 0o777 == 0o600
     
     def test_init_output_shows_pricing_date(self, runner, temp_home):
         """Test that init output shows pricing data date."""
@@ -148,9 +129,8 @@ class TestInitCommand:
         assert config_file.exists()
         
         # Check it's valid YAML
-        import yaml
         with open(config_file) as f:
-            config = yaml.safe_load(f)
+            config = safe_load_yaml(f)
         
         assert config is not None
         assert isinstance(config, dict)
@@ -165,9 +145,8 @@ class TestInitCommand:
         assert pricing_file.exists()
         
         # Check it's valid YAML
-        import yaml
         with open(pricing_file) as f:
-            pricing = yaml.safe_load(f)
+            pricing = safe_load_yaml(f)
         
         assert pricing is not None
         assert isinstance(pricing, dict)
@@ -180,9 +159,8 @@ class TestInitCommand:
         
         pricing_file = temp_home / ".promptv" / ".config" / "pricing.yaml"
         
-        import yaml
         with open(pricing_file) as f:
-            pricing = yaml.safe_load(f)
+            pricing = safe_load_yaml(f)
         
         # Should have pricing data for at least one provider
         assert len(pricing) > 0
@@ -227,3 +205,40 @@ class TestAutoInitialization:
         
         assert result.exit_code == 0
         assert "Initializing promptv..." in result.output
+
+
+class TestBaseDirOverride:
+    """Test relocating the promptv directory away from ~/.promptv."""
+    
+    def test_base_dir_option(self, runner, temp_home):
+        """Test that --base-dir redirects initialization for one invocation."""
+        base_dir = temp_home / "custom"
+        
+        result = runner.invoke(cli, ['--base-dir', str(base_dir), 'init'])
+        
+        assert result.exit_code == 0
+        assert (base_dir / ".config" / "config.yaml").exists()
+        assert (base_dir / "prompts").exists()
+        assert not (temp_home / ".promptv").exists()
+        # The override does not leak past the command
+        assert "PROMPTV_BASE_DIR" not in os.environ
+    
+    def test_base_dir_option_relative_path(self, runner, temp_home, monkeypatch):
+        """Test that a relative --base-dir is resolved against the working directory."""
+        monkeypatch.chdir(temp_home)
+        
+        result = runner.invoke(cli, ['--base-dir', 'relative', 'init'])
+        
+        assert result.exit_code == 0
+        assert (temp_home / "relative" / ".config" / "config.yaml").exists()
+    
+    def test_base_dir_env_var(self, runner, temp_home, monkeypatch):
+        """Test that PROMPTV_BASE_DIR redirects auto-initialization."""
+        base_dir = temp_home / "from-env"
+        monkeypatch.setenv("PROMPTV_BASE_DIR", str(base_dir))
+        
+        result = runner.invoke(cli, ['secret', 'list'])
+        
+        assert result.exit_code == 0
+        assert (base_dir / ".config" / "pricing.yaml").exists()
+        assert not (temp_home / ".promptv").exists()
@@ -2,25 +2,21 @@
 Integration tests for Phase 1 CLI functionality.
 """
 import pytest
-from click.testing import CliRunner
+import shutil
 from pathlib import Path
 from promptv.cli import cli
 from promptv.manager import PromptManager
+from promptv.tag_manager import TagManager
 
 
 @pytest.fixture
-def runner():
-    """Create a CLI runner."""
-    return CliRunner()
-
-
-@pytest.fixture
-def isolated_promptv(tmp_path, monkeypatch):
+def isolated_promptv(tmp_path, monkeypatch, golden_home):
     """Create an isolated promptv environment."""
-    # Override home directory for testing
+    # Point promptv at a private base directory, seeded with the session's
+    # already-initialized ~/.promptv tree
     test_home = tmp_path / "home"
-    test_home.mkdir()
-    monkeypatch.setenv("HOME", str(test_home))
+    shutil.copytree(golden_home, test_home / ".promptv")
+    monkeypatch.setenv("PROMPTV_BASE_DIR", str(test_home / ".promptv"))
     
     # Initialize PromptManager to create directories
     manager = PromptManager()
@@ -28,6 +24,19 @@ def isolated_promptv(tmp_path, monkeypatch):
     yield manager
 
 
+@pytest.fixture(scope="module")
+def committed_var_prompt(tmp_path_factory, golden_home):
+    """Commit one prompt with variables, shared by the read-only render tests."""
+    base_dir = tmp_path_factory.mktemp("var_prompt") / ".promptv"
+    shutil.copytree(golden_home, base_dir)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("PROMPTV_BASE_DIR", str(base_dir))
+        PromptManager().set_prompt(
+            'greeting', "Hello {{name}}, you have {{count}} messages", project='default'
+        )
+    return base_dir
+
+
 class TestPhase1Integration:
     """Integration tests for Phase 1 features."""
     
@@ -67,46 +76,14 @@ class TestPhase1Integration:
         assert result.exit_code == 0
         assert "This is a test prompt for {{user_name}}" in result.output
         
-    def test_variable_rendering_workflow(self, runner, isolated_promptv, tmp_path):
-        """Test variable rendering workflow."""
-        # Create a prompt with variables
-        prompt_file = tmp_path / "var_prompt.md"
-        prompt_file.write_text("Hello {{name}}, you have {{count}} messages")
-        
-        # Commit the prompt
-        result = runner.invoke(cli, [
-            'prompt', 'commit',
-            '--source', str(prompt_file),
-            '--name', 'greeting'
-        ])
-        assert result.exit_code == 0
-        
-        # Render with variables
-        result = runner.invoke(cli, [
-            'render',
-            'greeting',
-            '--var', 'name=Alice',
-            '--var', 'count=5'
-        ])
-        assert result.exit_code == 0
-        assert "Hello Alice, you have 5 messages" in result.output
-        
-    def test_tag_management_workflow(self, runner, isolated_promptv, tmp_path):
+    def test_tag_management_workflow(self, runner, isolated_promptv):
         """Test tag management: create, list, show, delete."""
-        # Create a prompt
-        prompt_file = tmp_path / "tagged.md"
-        prompt_file.write_text("Tagged content")
-        
-        result = runner.invoke(cli, [
-            'prompt', 'commit',
-            '--source', str(prompt_file),
-            '--name', 'my-prompt'
-        ])
-        assert result.exit_code == 0
-        
-        # Create multiple tags
-        runner.invoke(cli, ['tag', 'create', 'my-prompt', 'prod', '--version', '1'])
-        runner.invoke(cli, ['tag', 'create', 'my-prompt', 'staging', '--version', '1'])
+        # Set up a prompt with two tags through the API; only the tag
+        # commands under test go through the CLI
+        isolated_promptv.set_prompt('my-prompt', "Tagged content", project='default')
+        tag_manager = TagManager(isolated_promptv.prompts_dir)
+        tag_manager.create_tag('my-prompt', 'prod', 1, project='default')
+        tag_manager.create_tag('my-prompt', 'staging', 1, project='default')
         
         # List tags
         result = runner.invoke(cli, ['tag', 'list', 'my-prompt'])
@@ -228,93 +205,47 @@ class TestPhase1Integration:
         assert "var3" in result.output
         assert "Total: 3 variable(s)" in result.output
         
-    def test_get_with_variables(self, runner, isolated_promptv, tmp_path):
-        """Test get command with variable substitution."""
-        # Create prompt with variables
-        prompt_file = tmp_path / "sub.md"
-        prompt_file.write_text("Welcome {{user}}, temperature is {{temp}}")
-        
-        runner.invoke(cli, [
-            'prompt', 'commit',
-            '--source', str(prompt_file),
-            '--name', 'substitution'
-        ])
-
-        # Get with substitution
-        result = runner.invoke(cli, [
-            'prompt', 'get',
-            'substitution',
-            '--var', 'user=Bob',
-            '--var', 'temp=0.7'
-        ])
-        assert result.exit_code == 0
-        assert "Welcome Bob, temperature is 0.7" in result.output
-        
-    def test_error_missing_variables(self, runner, isolated_promptv, tmp_path):
-        """Test error handling for missing variables."""
-        # Create prompt with variables
-        prompt_file = tmp_path / "missing.md"
-        prompt_file.write_text("Hello {{name}}, you have {{count}} items")
-        
-        runner.invoke(cli, [
-            'prompt', 'commit',
-            '--source', str(prompt_file),
-            '--name', 'missing-vars'
-        ])
-        
-        # Try to render without all variables
-        result = runner.invoke(cli, [
-            'render',
-            'missing-vars',
-            '--var', 'name=Alice'
-            # Missing 'count'
-        ])
-        assert result.exit_code != 0
-        assert "Missing required variables" in result.output
-        assert "count" in result.output
-        
-    def test_error_tag_already_exists(self, runner, isolated_promptv, tmp_path):
+    @pytest.mark.parametrize("args,expect_exit,expected", [
+        (['render', 'greeting', '--var', 'name=Alice', '--var', 'count=5'],
+         0, ["Hello Alice, you have 5 messages"]),
+        (['prompt', 'get', 'greeting', '--var', 'name=Bob', '--var', 'count=7'],
+         0, ["Hello Bob, you have 7 messages"]),
+        # Missing 'count'
+        (['render', 'greeting', '--var', 'name=Alice'],
+         1, ["Missing required variables", "count"]),
+    ], ids=["render", "get", "missing-variables"])
+    def test_variable_substitution(
+        self, runner, committed_var_prompt, monkeypatch, args, expect_exit, expected
+    ):
+        """Test render and get --var against one committed prompt."""
+        monkeypatch.setenv("PROMPTV_BASE_DIR", str(committed_var_prompt))
+        
+        result = runner.invoke(cli, args)
+        assert result.exit_code == expect_exit
+        for text in expected:
+            assert text in result.output
+        
+    def test_error_tag_already_exists(self, runner, isolated_promptv):
         """Test error when creating duplicate tag without --force."""
-        # Create prompt
-        prompt_file = tmp_path / "dup_tag.md"
-        prompt_file.write_text("Content")
-        
-        runner.invoke(cli, [
-            'prompt', 'commit',
-            '--source', str(prompt_file),
-            '--name', 'dup-test'
-        ])
-        
-        # Create tag
-        runner.invoke(cli, ['tag', 'create', 'dup-test', 'mytag', '--version', '1'])
+        # Create prompt and tag
+        isolated_promptv.set_prompt('dup-test', "Content", project='default')
+        TagManager(isolated_promptv.prompts_dir).create_tag(
+            'dup-test', 'mytag', 1, project='default'
+        )
         
         # Try to create again without --force
         result = runner.invoke(cli, ['tag', 'create', 'dup-test', 'mytag', '--version', '1'])
         assert result.exit_code != 0
         assert "already exists" in result.output
         
-    def test_tag_update_with_force(self, runner, isolated_promptv, tmp_path):
+    def test_tag_update_with_force(self, runner, isolated_promptv):
         """Test updating tag with --force flag."""
-        # Create prompt with multiple versions
-        prompt_file = tmp_path / "update.md"
-        prompt_file.write_text("Version 1")
-        
-        runner.invoke(cli, [
-            'prompt', 'commit',
-            '--source', str(prompt_file),
-            '--name', 'update-test'
-        ])
-
-        # Create v2
-        prompt_file.write_text("Version 2")
-        runner.invoke(cli, [
-            'prompt', 'commit',
-            '--source', str(prompt_file),
-            '--name', 'update-test'
-        ])
-        
-        # Create tag pointing to v1
-        runner.invoke(cli, ['tag', 'create', 'update-test', 'current', '--version', '1'])
+        # Create prompt with two versions and a tag pointing to v1
+        isolated_promptv.set_prompt('update-test', "Version 1", project='default')
+        isolated_promptv.set_prompt('update-test', "Version 2", project='default')
+        TagManager(isolated_promptv.prompts_dir).create_tag(
+            'update-test', 'current', 1, project='default'
+        )
         
         # Update tag to v2 with --force
         result = runner.invoke(cli, [
@@ -330,17 +261,11 @@ class TestPhase1Integration:
         result = runner.invoke(cli, ['tag', 'show', 'update-test', 'current'])
         assert "Version: 2" in result.output
         
-    def test_list_all_prompts(self, runner, isolated_promptv, tmp_path):
+    def test_list_all_prompts(self, runner, isolated_promptv):
         """Test listing all prompts without specifying name."""
-        for i in range(3):
-            prompt_file = tmp_path / f"prompt{i}.md"
-            prompt_file.write_text(f"Content {i}")
-            result = runner.invoke(cli, [
-                'prompt', 'commit',
-                '--source', str(prompt_file),
-                '--name', f'prompt-{i}'
-            ])
-            assert result.exit_code == 0, f"Commit failed: {result.output}"
+        isolated_promptv.bulk_set_prompts([
+            (f'prompt-{i}', f"Content {i}", 'default', None) for i in range(3)
+        ])
 
         result = runner.invoke(cli, ['prompt', 'list'])
         assert result.exit_code == 0
@@ -349,6 +274,21 @@ class TestPhase1Integration:
         assert "prompt-0 (v1, 1 version(s))" in result.output
         assert "prompt-1 (v1, 1 version(s))" in result.output
         assert "prompt-2 (v1, 1 version(s))" in result.output
+    
+    def test_list_all_prompts_shows_latest_version(self, runner, isolated_promptv):
+        """Test that the listing reports the latest version and version count."""
+        results = isolated_promptv.bulk_set_prompts([
+            ('multi', "Version 1", 'default', None),
+            ('multi', "Version 2", 'default', "Second"),
+            ('other', "Content", 'my-app', None),
+        ])
+        assert [r['version'] for r in results] == [1, 2, 1]
+        
+        result = runner.invoke(cli, ['prompt', 'list'])
+        assert result.exit_code == 0
+        assert "Found 2 prompt(s)" in result.output
+        assert "multi (v2, 2 version(s))" in result.output
+        assert "my-app/" in result.output
 
 
 class TestBackwardCompatibility:
@@ -2,82 +2,139 @@
 Integration tests for Phase 3: Cost Estimation & Analysis.
 """
 import pytest
-import tempfile
 import shutil
 from pathlib import Path
-from click.testing import CliRunner
+from unittest.mock import patch
 
 from promptv.cli import cli
 from promptv.manager import PromptManager
+from promptv.models import CostEstimate
 from promptv.sdk.client import PromptClient
 
 
+@pytest.fixture(scope="session")
+def prepared_prompt_tree(tmp_path_factory):
+    """Commit the shared test prompts once per session."""
+    base_dir = tmp_path_factory.mktemp("phase3")
+    manager = PromptManager()
+    manager.base_dir = base_dir
+    manager.prompts_dir = base_dir / "prompts"
+    manager.config_dir = base_dir / ".config"
+    manager._initialize_directories()
+    
+    content = "Write a detailed summary of {{topic}} in {{length}} words."
+    manager.set_prompt("test-prompt", content, message="Test prompt")
+    manager.set_prompt(
+        "project-prompt", "This is a test prompt in a project.", project="my-project"
+    )
+    
+    return base_dir
+
+
+@pytest.fixture(scope="class")
+def client(prepared_prompt_tree):
+    """Create one read-only SDK client over the session's prompt tree."""
+    return PromptClient(base_dir=prepared_prompt_tree)
+
+
 class TestPhase3Integration:
     """Integration tests for cost estimation features."""
     
     @pytest.fixture
-    def temp_dir(self):
-        """Create a temporary directory for testing."""
-        temp_dir = Path(tempfile.mkdtemp())
-        yield temp_dir
-        shutil.rmtree(temp_dir)
+    def temp_dir(self, tmp_path):
+        """Create a temporary directory for testing (cleaned up by pytest)."""
+        return tmp_path
     
     @pytest.fixture
-    def setup_prompt(self, temp_dir):
-        """Setup a test prompt."""
-        manager = PromptManager()
-        manager.base_dir = temp_dir
-        manager.prompts_dir = temp_dir / "prompts"
-        manager.config_dir = temp_dir / ".config"
-        manager._initialize_directories()
-        
-        content = "Write a detailed summary of {{topic}} in {{length}} words."
-        manager.set_prompt("test-prompt", content, message="Test prompt")
-        
+    def setup_prompt(self, temp_dir, prepared_prompt_tree):
+        """Setup a test prompt (copied from the session's committed tree)."""
+        shutil.copytree(prepared_prompt_tree, temp_dir, dirs_exist_ok=True)
         return temp_dir
     
-    def test_cost_estimate_command(self, setup_prompt):
+    @pytest.fixture
+    def home(self, setup_prompt, monkeypatch):
+        """Set HOME for the CLI tests once, as the prompt tree's parent."""
+        home = setup_prompt.parent
+        monkeypatch.setenv("HOME", str(home))
+        return home
+    
+    def test_cost_estimate_command(self, home, runner):
         """Test CLI cost estimate command."""
-        runner = CliRunner()
         result = runner.invoke(cli, [
             'cost', 'estimate', 'test-prompt',
             '--model', 'gpt-4',
             '--provider', 'openai',
             '--output-tokens', '100'
-        ], env={'HOME': str(setup_prompt.parent)})
+        ])
         
         # May fail if prompt not found, but should show proper error
         # The SDK tests confirm the functionality works
         # This is just testing the CLI interface
         assert 'gpt-4' in result.output or 'Error' in result.output
     
-    def test_cost_tokens_command(self, setup_prompt):
+    def test_cost_tokens_command(self, home, runner):
         """Test CLI cost tokens command."""
-        runner = CliRunner()
         result = runner.invoke(cli, [
             'cost', 'tokens', 'test-prompt',
             '--model', 'gpt-4'
-        ], env={'HOME': str(setup_prompt.parent)})
+        ])
         
         # May fail if prompt not found
         assert 'tokens' in result.output.lower() or 'error' in result.output.lower()
     
-    def test_cost_compare_command(self, setup_prompt):
+    def test_cost_compare_command(self, home, runner):
         """Test CLI cost compare command."""
-        runner = CliRunner()
         result = runner.invoke(cli, [
             'cost', 'compare', 'test-prompt',
             '-m', 'openai/gpt-4',
             '-m', 'openai/gpt-3.5-turbo',
             '--output-tokens', '100'
-        ], env={'HOME': str(setup_prompt.parent)})
+        ])
         
         # May fail if prompt not found
         assert 'gpt-4' in result.output or 'error' in result.output.lower()
     
-    def test_cost_models_command(self, setup_prompt):
+    def test_cost_compare_plain_command(self, runner, tmp_path, monkeypatch):
+        """Test that cost compare --plain prints the unstyled table."""
+        monkeypatch.setenv("PROMPTV_BASE_DIR", str(tmp_path / ".promptv"))
+        PromptManager().set_prompt("plain-prompt", "Summarize the report.", project="default")
+        comparisons = {
+            "openai/gpt-4": CostEstimate(
+                input_tokens=4, estimated_output_tokens=100, total_tokens=104,
+                input_cost=0.005, estimated_output_cost=0.005, total_cost=0.01,
+                model="gpt-4", provider="openai"
+            ),
+            "openai/gpt-3.5-turbo": CostEstimate(
+                input_tokens=4, estimated_output_tokens=100, total_tokens=104,
+                input_cost=0.0005, estimated_output_cost=0.0005, total_cost=0.001,
+                model="gpt-3.5-turbo", provider="openai"
+            ),
+        }
+        
+        # Token counting is covered by the SDK tests; this checks the wiring
+        with patch('promptv.cli.CostEstimator') as estimator_class:
+            estimator = estimator_class.return_value
+            estimator.compare_costs.return_value = comparisons
+            result = runner.invoke(cli, [
+                'cost', 'compare', 'plain-prompt',
+                '-m', 'openai/gpt-4',
+                '-m', 'openai/gpt-3.5-turbo',
+                '--output-tokens', '100',
+                '--plain'
+            ])
+        
+        assert result.exit_code == 0
+        estimator.compare_costs.assert_called_once_with(
+            "Summarize the report.", [('openai', 'gpt-4'), ('openai', 'gpt-3.5-turbo')], 100
+        )
+        assert "\x1b[" not in result.output
+        lines = result.output.splitlines()
+        assert lines[0].startswith("Provider/Model")
+        assert lines[2].startswith("openai/gpt-3.5-turbo")
+        assert lines[-1] == "Cheapest option: openai/gpt-3.5-turbo at $0.001000"
+    
+    def test_cost_models_command(self, setup_prompt, runner):
         """Test CLI cost models command."""
-        runner = CliRunner()
         with runner.isolated_filesystem(temp_dir=setup_prompt):
             result = runner.invoke(cli, ['cost', 'models'])
             
@@ -86,10 +143,8 @@ class TestPhase3Integration:
             assert 'openai' in result.output
             assert 'anthropic' in result.output
     
-    def test_sdk_cost_estimation(self, setup_prompt):
+    def test_sdk_cost_estimation(self, client):
         """Test SDK cost estimation methods."""
-        client = PromptClient(base_dir=setup_prompt)
-        
         # Test estimate_cost
         cost = client.estimate_cost(
             'test-prompt',
@@ -104,10 +159,8 @@ class TestPhase3Integration:
         assert cost.model == 'gpt-4'
         assert cost.provider == 'openai'
     
-    def test_sdk_count_tokens(self, setup_prompt):
+    def test_sdk_count_tokens(self, client):
         """Test SDK count_tokens method."""
-        client = PromptClient(base_dir=setup_prompt)
-        
         tokens = client.count_tokens(
             'test-prompt',
             model='gpt-4',
@@ -117,10 +170,8 @@ class TestPhase3Integration:
         assert tokens > 0
         assert isinstance(tokens, int)
     
-    def test_sdk_compare_costs(self, setup_prompt):
+    def test_sdk_compare_costs(self, client):
         """Test SDK compare_costs method."""
-        client = PromptClient(base_dir=setup_prompt)
-        
         models = [
             ('openai', 'gpt-4'),
             ('openai', 'gpt-3.5-turbo')
@@ -136,10 +187,8 @@ class TestPhase3Integration:
         assert 'openai/gpt-3.5-turbo' in comparisons
         assert comparisons['openai/gpt-4'].total_cost > comparisons['openai/gpt-3.5-turbo'].total_cost
     
-    def test_cost_estimation_with_variables(self, setup_prompt):
+    def test_cost_estimation_with_variables(self, client):
         """Test cost estimation with variable rendering."""
-        client = PromptClient(base_dir=setup_prompt)
-        
         cost = client.estimate_cost(
             'test-prompt',
             variables={'topic': 'AI', 'length': '500'},
@@ -169,72 +218,22 @@ class TestPhase3Integration:
         assert version_meta.token_count is not None
         assert version_meta.token_count > 0
 
-    def test_cost_estimate_with_project(self, temp_dir):
-        """Test CLI cost estimate command with project parameter."""
-        runner = CliRunner()
-        # Set up a project-scoped prompt
-        manager = PromptManager()
-        manager.base_dir = temp_dir
-        manager.prompts_dir = temp_dir / "prompts"
-        manager.config_dir = temp_dir / ".config"
-        manager._initialize_directories()
-
-        content = "This is a test prompt in a project."
-        manager.set_prompt("project-prompt", content, project="my-project")
-
+    @pytest.mark.parametrize("args", [
+        ['estimate', '--model', 'gpt-4', '--provider', 'openai', '--output-tokens', '100'],
+        ['tokens', '--model', 'gpt-4'],
+        ['compare', '-m', 'openai/gpt-4', '-m', 'openai/gpt-3.5-turbo', '--output-tokens', '100'],
+    ], ids=['estimate', 'tokens', 'compare'])
+    def test_cost_commands_with_project(self, setup_prompt, runner, monkeypatch, args):
+        """Test CLI cost subcommands with project parameter."""
+        # Read the copied tree, where 'project-prompt' lives in 'my-project'
+        monkeypatch.setenv("PROMPTV_BASE_DIR", str(setup_prompt))
+        subcommand, *options = args
         result = runner.invoke(cli, [
-            'cost', 'estimate', 'project-prompt',
+            'cost', subcommand, 'project-prompt',
             '--project', 'my-project',
-            '--model', 'gpt-4',
-            '--provider', 'openai',
-            '--output-tokens', '100'
-        ], env={'HOME': str(temp_dir.parent)})
+            *options
+        ])
 
         # Should succeed and show cost information
-        assert result.exit_code == 0 or 'Error' in result.output
-
-    def test_cost_tokens_with_project(self, temp_dir):
-        """Test CLI cost tokens command with project parameter."""
-        runner = CliRunner()
-        # Set up a project-scoped prompt
-        manager = PromptManager()
-        manager.base_dir = temp_dir
-        manager.prompts_dir = temp_dir / "prompts"
-        manager.config_dir = temp_dir / ".config"
-        manager._initialize_directories()
-
-        content = "Token counting test in project."
-        manager.set_prompt("token-project-prompt", content, project="my-project")
-
-        result = runner.invoke(cli, [
-            'cost', 'tokens', 'token-project-prompt',
-            '--project', 'my-project',
-            '--model', 'gpt-4'
-        ], env={'HOME': str(temp_dir.parent)})
-
-        # Should succeed and show token count
-        assert result.exit_code == 0 or 'Error' in result.output
-
-    def test_cost_compare_with_project(self, temp_dir):
-        """Test CLI cost compare command with project parameter."""
-        runner = CliRunner()
-        # Set up a project-scoped prompt
-        manager = PromptManager()
-        manager.base_dir = temp_dir
-        manager.prompts_dir = temp_dir / "prompts"
-        manager.config_dir = temp_dir / ".config"
-        manager._initialize_directories()
-
-        content = "Comparison test prompt in project."
-        manager.set_prompt("compare-project-prompt", content, project="my-project")
-
-        result = runner.invoke(cli, [
-            'cost', 'compare', 'compare-project-prompt',
-            '--project', 'my-project',
-            '-m', 'openai/gpt-4',
-            '-m', 'openai/gpt-3.5-turbo',
-            '--output-tokens', '100'
-        ], env={'HOME': str(temp_dir.parent)})
-
-        # Should succeed and show comparison
-        assert result.exit_code == 0 or 'Error' in result.output
\ No newline at end of file
+        assert result.exit_code == 0, result.output
+        assert 'not found' not in result.output
\ No newline at end of file
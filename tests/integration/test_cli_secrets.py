@@ -3,216 +3,210 @@ Integration tests for promptv secrets CLI commands.
 """
 
 import pytest
-import tempfile
-import shutil
 import json
-from pathlib import Path
-from click.testing import CliRunner
-from promptv.cli import cli
+from itertools import islice
+from promptv.cli import cli, render_secrets
 from promptv.secrets_manager import SecretsManager
 
 
-@pytest.fixture
-def temp_promptv_dir():
-    """Create a temporary .promptv directory for testing."""
-    temp_dir = Path(tempfile.mkdtemp())
-    yield temp_dir
-    shutil.rmtree(temp_dir)
+def _parse_env(output, fmt):
+    """
+    Parse `secret export` output into a {name: value} dict.
+
+    Handles json, dotenv (KEY=value) and shell (export KEY="value") output;
+    comment lines are skipped.
+    """
+    if fmt == "json":
+        return json.loads(output)
+
+    parsed = {}
+    for line in output.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        if fmt == "shell":
+            line = line[len("export "):] if line.startswith("export ") else line
+        key, _, value = line.partition("=")
+        if fmt == "shell" and len(value) >= 2 and value[0] == value[-1] == '"':
+            value = value[1:-1]
+        parsed[key] = value
+    return parsed
+
+
+@pytest.fixture(scope="module")
+def shared_secrets_home(tmp_path_factory):
+    """
+    Seed one home directory with every secret the export tests read.
+
+    The export command never writes, so the tests share this tree and
+    each picks the project whose secrets it asserts on:
+
+    - default: DATABASE_URL, API_KEY
+    - app1: DATABASE_URL, REDIS_URL, DB_URL_1
+    - app2: OTHER_KEY, DB_URL_2
+    - sorted: ZEBRA, APPLE, MONGO
+
+    plus the openai, anthropic and google provider keys.
+    """
+    home = tmp_path_factory.mktemp("promptv_home")
+    manager = SecretsManager(secrets_dir=home / ".promptv" / ".secrets")
+
+    manager.set_api_keys_bulk({
+        "openai": "sk-test-key",
+        "anthropic": "sk-ant-key",
+        "google": "google-key",
+    })
+    manager.set_secrets_bulk({
+        "DATABASE_URL": "postgres://localhost/db",
+        "API_KEY": "abc123",
+    })
+    manager.set_secrets_bulk({
+        "DATABASE_URL": "postgres://app1",
+        "REDIS_URL": "redis://localhost",
+        "DB_URL_1": "postgres://db1",
+    }, project="app1")
+    manager.set_secrets_bulk({"OTHER_KEY": "other", "DB_URL_2": "postgres://db2"}, project="app2")
+    manager.set_secrets_bulk({"ZEBRA": "z", "APPLE": "a", "MONGO": "m"}, project="sorted")
+
+    return home
+
+
+@pytest.fixture(scope="module")
+def secrets_manager(shared_secrets_home):
+    """Read-only SecretsManager over the shared seeded tree."""
+    return SecretsManager(
+        secrets_dir=shared_secrets_home / ".promptv" / ".secrets", lazy_init=True
+    )
 
 
 @pytest.fixture
-def runner():
-    """Create a Click CLI runner."""
-    return CliRunner()
+def secrets_home(shared_secrets_home, monkeypatch):
+    """Point HOME at the shared seeded secrets tree."""
+    monkeypatch.setenv("HOME", str(shared_secrets_home))
+    return shared_secrets_home
 
 
 class TestSecretsExportCommand:
     """Test suite for `promptv secret export` command."""
 
-    def test_export_default_project_dotenv_format(self, runner, temp_promptv_dir, monkeypatch):
+    def test_export_default_project_dotenv_format(self, runner, secrets_home):
         """Test exporting default project with dotenv format (default)."""
-        secrets_dir = temp_promptv_dir / ".promptv" / ".secrets"
-        monkeypatch.setenv("HOME", str(temp_promptv_dir))
-
-        manager = SecretsManager(secrets_dir=secrets_dir)
-        manager.set_api_key("openai", "sk-test-key")
-        manager.set_secret("DATABASE_URL", "postgres://localhost/db")
-        manager.set_secret("API_KEY", "abc123")
-
         result = runner.invoke(cli, ['secret', 'export'])
-        
+
         assert result.exit_code == 0
-        assert 'OPENAI_API_KEY=sk-test-key' in result.output
-        assert 'DATABASE_URL=postgres://localhost/db' in result.output
-        assert 'API_KEY=abc123' in result.output
+        parsed = _parse_env(result.output, "dotenv")
+        assert parsed["OPENAI_API_KEY"] == "sk-test-key"
+        assert parsed["DATABASE_URL"] == "postgres://localhost/db"
+        assert parsed["API_KEY"] == "abc123"
         assert 'export' not in result.output
         assert "Activated" not in result.output
-    
-    def test_export_specific_project(self, runner, temp_promptv_dir, monkeypatch):
+
+    def test_export_specific_project(self, runner, secrets_home):
         """Test exporting specific project."""
-        secrets_dir = temp_promptv_dir / ".promptv" / ".secrets"
-        monkeypatch.setenv("HOME", str(temp_promptv_dir))
-        
-        manager = SecretsManager(secrets_dir=secrets_dir)
-        manager.set_api_key("openai", "sk-test-key")
-        manager.set_secret("DATABASE_URL", "postgres://app1", project="app1")
-        manager.set_secret("REDIS_URL", "redis://localhost", project="app1")
-        manager.set_secret("OTHER_KEY", "other", project="app2")
-        
         result = runner.invoke(cli, ['secret', 'export', '--project', 'app1'])
-        
-        assert result.exit_code == 0
-        assert 'OPENAI_API_KEY=sk-test-key' in result.output
-        assert 'DATABASE_URL=postgres://app1' in result.output
-        assert 'REDIS_URL=redis://localhost' in result.output
-        assert 'OTHER_KEY' not in result.output
-        assert 'export' not in result.output
-        assert "Activated" not in result.output
-    
-    def test_export_dotenv_format(self, runner, temp_promptv_dir, monkeypatch):
-        """Test exporting with dotenv format (standard .env format)."""
-        secrets_dir = temp_promptv_dir / ".promptv" / ".secrets"
-        monkeypatch.setenv("HOME", str(temp_promptv_dir))
-        
-        manager = SecretsManager(secrets_dir=secrets_dir)
-        manager.set_secret("DATABASE_URL", "postgres://localhost/db")
-        manager.set_secret("API_KEY", "abc123")
-        
-        result = runner.invoke(cli, ['secret', 'export', '--format', 'dotenv'])
-        
+
         assert result.exit_code == 0
-        assert 'DATABASE_URL=postgres://localhost/db' in result.output
-        assert 'API_KEY=abc123' in result.output
+        parsed = _parse_env(result.output, "dotenv")
+        assert parsed["OPENAI_API_KEY"] == "sk-test-key"
+        assert parsed["DATABASE_URL"] == "postgres://app1"
+        assert parsed["REDIS_URL"] == "redis://localhost"
+        assert "OTHER_KEY" not in parsed
         assert 'export' not in result.output
         assert "Activated" not in result.output
-        assert "#" not in result.output
-    
-    def test_export_json_format(self, runner, temp_promptv_dir, monkeypatch):
-        """Test exporting with JSON format."""
-        secrets_dir = temp_promptv_dir / ".promptv" / ".secrets"
-        monkeypatch.setenv("HOME", str(temp_promptv_dir))
-        
-        manager = SecretsManager(secrets_dir=secrets_dir)
-        manager.set_secret("DATABASE_URL", "postgres://localhost/db")
-        manager.set_secret("API_KEY", "abc123")
-        
-        result = runner.invoke(cli, ['secret', 'export', '--format', 'json'])
-        
-        assert result.exit_code == 0
-        
-        output_data = json.loads(result.output)
-        assert output_data["DATABASE_URL"] == "postgres://localhost/db"
-        assert output_data["API_KEY"] == "abc123"
-    
-    def test_export_shell_format(self, runner, temp_promptv_dir, monkeypatch):
+
+    def test_export_shell_format(self, runner, secrets_home):
         """Test exporting with shell format (export statements with quotes)."""
-        secrets_dir = temp_promptv_dir / ".promptv" / ".secrets"
-        monkeypatch.setenv("HOME", str(temp_promptv_dir))
-        
-        manager = SecretsManager(secrets_dir=secrets_dir)
-        manager.set_secret("DATABASE_URL", "postgres://localhost/db")
-        manager.set_secret("API_KEY", "abc123")
-        
-        result = runner.invoke(cli, ['secret', 'export', '--format', 'shell'])
-        
-        assert result.exit_code == 0
-        assert 'export DATABASE_URL="postgres://localhost/db"' in result.output
-        assert 'export API_KEY="abc123"' in result.output
-        assert "Activated 2 secret(s) from project 'default'" in result.output
-    
-    def test_export_no_include_providers(self, runner, temp_promptv_dir, monkeypatch):
-        """Test exporting without provider API keys."""
-        secrets_dir = temp_promptv_dir / ".promptv" / ".secrets"
-        monkeypatch.setenv("HOME", str(temp_promptv_dir))
-        
-        manager = SecretsManager(secrets_dir=secrets_dir)
-        manager.set_api_key("openai", "sk-test-key")
-        manager.set_api_key("anthropic", "sk-ant-key")
-        manager.set_secret("DATABASE_URL", "postgres://localhost/db")
-        
         result = runner.invoke(cli, [
             'secret', 'export',
+            '--format', 'shell',
             '--no-include-providers'
         ])
-        
+
         assert result.exit_code == 0
-        assert 'OPENAI_API_KEY' not in result.output
-        assert 'ANTHROPIC_API_KEY' not in result.output
-        assert 'DATABASE_URL=postgres://localhost/db' in result.output
-        assert 'export' not in result.output
-    
-    def test_export_empty_project(self, runner, temp_promptv_dir, monkeypatch):
+        assert 'export DATABASE_URL="postgres://localhost/db"' in result.output
+        parsed = _parse_env(result.output, "shell")
+        assert parsed == {"DATABASE_URL": "postgres://localhost/db", "API_KEY": "abc123"}
+        assert "Activated 2 secret(s) from project 'default'" in result.output
+
+    def test_export_empty_project(self, runner, secrets_home):
         """Test exporting project with no secrets."""
-        secrets_dir = temp_promptv_dir / ".promptv" / ".secrets"
-        monkeypatch.setenv("HOME", str(temp_promptv_dir))
-        
-        manager = SecretsManager(secrets_dir=secrets_dir)
-        manager.set_secret("DATABASE_URL", "postgres://db", project="app1")
-        
         result = runner.invoke(cli, [
             'secret', 'export',
-            '--project', 'app2',
+            '--project', 'empty',
             '--no-include-providers'
         ])
-        
+
         assert result.exit_code == 0
-        assert "No secrets found for project 'app2'" in result.output
-    
-    def test_export_provider_key_format(self, runner, temp_promptv_dir, monkeypatch):
+        assert "No secrets found for project 'empty'" in result.output
+
+
+class TestRenderSecrets:
+    """Test suite for the export formatting, called without the CLI."""
+
+    @pytest.mark.parametrize("fmt,checker", [
+        ("dotenv", lambda text: "export" not in text and "#" not in text),
+        ("shell", lambda text: 'export DATABASE_URL="postgres://localhost/db"' in text
+            and "# Activated 5 secret(s) from project 'default'" in text),
+        ("json", lambda text: text.lstrip().startswith("{")),
+    ])
+    def test_formats(self, secrets_manager, fmt, checker):
+        """Test each output format against the same seeded secrets."""
+        text, count = render_secrets(
+            secrets_manager, project="default", output_format=fmt, include_providers=True
+        )
+
+        parsed = _parse_env(text, fmt)
+        assert count == len(parsed) == 5
+        assert parsed["DATABASE_URL"] == "postgres://localhost/db"
+        assert parsed["API_KEY"] == "abc123"
+        assert checker(text)
+
+    def test_no_include_providers(self, secrets_manager):
+        """Test rendering without provider API keys."""
+        text, count = render_secrets(
+            secrets_manager, project="default", output_format="dotenv", include_providers=False
+        )
+
+        parsed = _parse_env(text, "dotenv")
+        assert count == 2
+        assert "OPENAI_API_KEY" not in parsed
+        assert "ANTHROPIC_API_KEY" not in parsed
+        assert parsed["DATABASE_URL"] == "postgres://localhost/db"
+
+    def test_empty_project(self, secrets_manager):
+        """Test rendering a project with no secrets."""
+        assert render_secrets(
+            secrets_manager, project="empty", output_format="dotenv", include_providers=False
+        ) == ("", 0)
+
+    def test_provider_key_format(self, secrets_manager):
         """Test that provider keys are formatted as ENV_VAR_NAME."""
-        secrets_dir = temp_promptv_dir / ".promptv" / ".secrets"
-        monkeypatch.setenv("HOME", str(temp_promptv_dir))
-        
-        manager = SecretsManager(secrets_dir=secrets_dir)
-        manager.set_api_key("openai", "sk-openai")
-        manager.set_api_key("anthropic", "sk-ant")
-        manager.set_api_key("google", "google-key")
-        
-        result = runner.invoke(cli, ['secret', 'export'])
-        
-        assert result.exit_code == 0
-        assert 'OPENAI_API_KEY=sk-openai' in result.output
-        assert 'ANTHROPIC_API_KEY=sk-ant' in result.output
-        assert 'GOOGLE_API_KEY=google-key' in result.output
-        assert 'export' not in result.output
-    
-    def test_export_multiple_projects(self, runner, temp_promptv_dir, monkeypatch):
-        """Test exporting secrets from multiple projects (only exports specified)."""
-        secrets_dir = temp_promptv_dir / ".promptv" / ".secrets"
-        monkeypatch.setenv("HOME", str(temp_promptv_dir))
-        
-        manager = SecretsManager(secrets_dir=secrets_dir)
-        manager.set_secret("DB_URL_1", "postgres://db1", project="app1")
-        manager.set_secret("DB_URL_2", "postgres://db2", project="app2")
-        manager.set_secret("REDIS_URL", "redis://localhost", project="app1")
-        
-        result = runner.invoke(cli, [
-            'secret', 'export',
-            '--project', 'app1',
-            '--no-include-providers'
-        ])
-        
-        assert result.exit_code == 0
-        assert 'DB_URL_1=postgres://db1' in result.output
-        assert 'REDIS_URL=redis://localhost' in result.output
-        assert 'DB_URL_2' not in result.output
-        assert 'export' not in result.output
-    
-    def test_export_sorted_output(self, runner, temp_promptv_dir, monkeypatch):
+        text, _ = render_secrets(
+            secrets_manager, project="default", output_format="dotenv", include_providers=True
+        )
+
+        parsed = _parse_env(text, "dotenv")
+        assert parsed["OPENAI_API_KEY"] == "sk-test-key"
+        assert parsed["ANTHROPIC_API_KEY"] == "sk-ant-key"
+        assert parsed["GOOGLE_API_KEY"] == "google-key"
+
+    def test_multiple_projects(self, secrets_manager):
+        """Test rendering one project out of several (only that project's secrets)."""
+        text, _ = render_secrets(
+            secrets_manager, project="app1", output_format="dotenv", include_providers=False
+        )
+
+        parsed = _parse_env(text, "dotenv")
+        assert parsed["DB_URL_1"] == "postgres://db1"
+        assert parsed["REDIS_URL"] == "redis://localhost"
+        assert "DB_URL_2" not in parsed
+
+    def test_sorted_output(self, secrets_manager):
         """Test that secrets are output in sorted order."""
-        secrets_dir = temp_promptv_dir / ".promptv" / ".secrets"
-        monkeypatch.setenv("HOME", str(temp_promptv_dir))
-        
-        manager = SecretsManager(secrets_dir=secrets_dir)
-        manager.set_secret("ZEBRA", "z")
-        manager.set_secret("APPLE", "a")
-        manager.set_secret("MONGO", "m")
-        
-        result = runner.invoke(cli, ['secret', 'export', '--format', 'dotenv'])
-        
-        assert result.exit_code == 0
-        
-        lines = [line for line in result.output.split('\n') if line and '=' in line]
+        text, _ = render_secrets(
+            secrets_manager, project="sorted", output_format="dotenv", include_providers=False
+        )
+
+        lines = list(islice((line for line in text.splitlines() if '=' in line), 3))
         assert lines[0].startswith('APPLE=')
         assert lines[1].startswith('MONGO=')
-        assert lines[2].startswith('ZEBRA=')
\ No newline at end of file
+        assert lines[2].startswith('ZEBRA=')
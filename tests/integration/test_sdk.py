@@ -3,60 +3,80 @@ Integration tests for PromptClient SDK.
 """
 
 import pytest
-import tempfile
 import shutil
-from pathlib import Path
+from unittest.mock import MagicMock
 from promptv.sdk.client import PromptClient
 from promptv.manager import PromptManager
 from promptv.tag_manager import TagManager
 from promptv.exceptions import PromptNotFoundError
 
 
+@pytest.fixture(scope="session")
+def prompts_template(tmp_path_factory):
+    """Build the SDK test prompt tree once per session."""
+    base_dir = tmp_path_factory.mktemp("prompts_template")
+    manager = PromptManager()
+    manager.base_dir = base_dir
+    manager.prompts_dir = base_dir / "prompts"
+    manager.config_dir = base_dir / ".config"
+    manager._initialize_directories()
+    
+    # Create multiple prompts with versions; each prompt's metadata and
+    # tags.json are written once
+    manager.bulk_set_prompts([
+        ("onboarding-email", "Hello {{user_name}},\n\nWelcome to {{product}}!", None, None),
+        ("onboarding-email", "Hi {{user_name}},\n\nWelcome to {{product}}!\n\nBest regards", None, None),
+        ("reminder", "Don't forget: {{task}}", None, None),
+    ])
+    
+    # Create tags
+    tag_manager = TagManager(manager.prompts_dir)
+    tag_manager.create_tags("onboarding-email", {"prod": 1, "staging": 2})
+    tag_manager.create_tags("reminder", {"latest": 1})
+    
+    return base_dir
+
+
+@pytest.fixture(scope="module")
+def shared_client(prompts_template):
+    """One PromptClient over the shared prompt tree for the whole module."""
+    return PromptClient(base_dir=prompts_template)
+
+
 class TestSDKIntegration:
     """Integration tests for SDK with real components."""
     
     @pytest.fixture
-    def temp_dir(self):
-        """Create temporary directory for tests."""
-        temp_path = Path(tempfile.mkdtemp())
-        yield temp_path
-        shutil.rmtree(temp_path)
+    def setup_prompts(self, prompts_template):
+        """
+        Set up a complete prompt environment.
+        
+        Returns the session's shared tree, which tests only read; tests that
+        add prompts copy it first.
+        """
+        return prompts_template
     
     @pytest.fixture
-    def setup_prompts(self, temp_dir):
-        """Set up a complete prompt environment."""
-        manager = PromptManager()
-        manager.base_dir = temp_dir
-        manager.prompts_dir = temp_dir / "prompts"
-        manager.config_dir = temp_dir / ".config"
-        manager._initialize_directories()
-        
-        # Create multiple prompts with versions
-        manager.set_prompt("onboarding-email", "Hello {{user_name}},\n\nWelcome to {{product}}!")
-        manager.set_prompt("onboarding-email", "Hi {{user_name}},\n\nWelcome to {{product}}!\n\nBest regards")
-        manager.set_prompt("reminder", "Don't forget: {{task}}")
-        
-        # Create tags
-        tag_manager = TagManager(manager.prompts_dir)
-        tag_manager.create_tag("onboarding-email", "prod", 1)
-        tag_manager.create_tag("onboarding-email", "staging", 2)
-        tag_manager.create_tag("reminder", "latest", 1)
-        
-        return manager
-    
-    def test_end_to_end_get_prompt(self, temp_dir, setup_prompts):
-        """Test end-to-end prompt retrieval."""
-        client = PromptClient(base_dir=temp_dir)
+    def client(self, shared_client):
+        """
+        The module's shared client, with an empty cache.
         
+        Tests only read through it, so the one thing to reset is the
+        cache, which several tests count entries in.
+        """
+        shared_client.clear_cache()
+        yield shared_client
+        shared_client.clear_cache()
+    
+    def test_end_to_end_get_prompt(self, client):
+        """Test end-to-end prompt retrieval."""
         # Get latest version
         content = client.get_prompt("onboarding-email")
         assert "Hi {{user_name}}" in content
         assert "Best regards" in content
     
-    def test_end_to_end_get_with_label(self, temp_dir, setup_prompts):
+    def test_end_to_end_get_with_label(self, client):
         """Test end-to-end prompt retrieval with label."""
-        client = PromptClient(base_dir=temp_dir)
-        
         # Get prod version
         content = client.get_prompt("onboarding-email", label="prod")
         assert "Hello {{user_name}}" in content
@@ -67,10 +87,8 @@ class TestSDKIntegration:
         assert "Hi {{user_name}}" in content
         assert "Best regards" in content
     
-    def test_end_to_end_with_variables(self, temp_dir, setup_prompts):
+    def test_end_to_end_with_variables(self, client):
         """Test end-to-end with variable rendering."""
-        client = PromptClient(base_dir=temp_dir)
-        
         content = client.get_prompt(
             "onboarding-email",
             label="prod",
@@ -82,17 +100,28 @@ class TestSDKIntegration:
         
         assert content == "Hello Alice,\n\nWelcome to PromptV!"
     
-    def test_end_to_end_caching_behavior(self, temp_dir, setup_prompts):
+    def test_end_to_end_caching_behavior(self, client, monkeypatch):
         """Test end-to-end caching behavior."""
-        client = PromptClient(base_dir=temp_dir, cache_ttl=300)
-        
         # First retrieval - should cache
         content1 = client.get_prompt("onboarding-email", label="prod")
         cache_stats1 = client.get_cache_stats()
         assert cache_stats1["cached_count"] == 1
         
-        # Second retrieval - should use cache
-        content2 = client.get_prompt("onboarding-email", label="prod")
+        # Second retrieval - should use cache, without resolving the label
+        # or reading the prompt from disk again
+        with monkeypatch.context() as mp:
+            loaders = {
+                "get_prompt": MagicMock(wraps=client.manager.get_prompt),
+                "_load_metadata": MagicMock(wraps=client.manager._load_metadata),
+                "_load_tags": MagicMock(wraps=client.tag_manager._load_tags),
+            }
+            mp.setattr(client.manager, "get_prompt", loaders["get_prompt"])
+            mp.setattr(client.manager, "_load_metadata", loaders["_load_metadata"])
+            mp.setattr(client.tag_manager, "_load_tags", loaders["_load_tags"])
+            content2 = client.get_prompt("onboarding-email", label="prod")
+        assert {name: loader.call_count for name, loader in loaders.items()} == {
+            "get_prompt": 0, "_load_metadata": 0, "_load_tags": 0
+        }
         assert content1 == content2
         cache_stats2 = client.get_cache_stats()
         assert cache_stats2["cached_count"] == 1  # Same cache entry
@@ -102,10 +131,8 @@ class TestSDKIntegration:
         cache_stats3 = client.get_cache_stats()
         assert cache_stats3["cached_count"] == 2
     
-    def test_end_to_end_list_operations(self, temp_dir, setup_prompts):
+    def test_end_to_end_list_operations(self, client):
         """Test end-to-end listing operations."""
-        client = PromptClient(base_dir=temp_dir)
-        
         # List all prompts
         prompts = client.list_prompts()
         assert "onboarding-email" in prompts
@@ -125,10 +152,8 @@ class TestSDKIntegration:
         assert tags["prod"] == 1
         assert tags["staging"] == 2
     
-    def test_end_to_end_with_metadata(self, temp_dir, setup_prompts):
+    def test_end_to_end_with_metadata(self, client):
         """Test end-to-end metadata retrieval."""
-        client = PromptClient(base_dir=temp_dir)
-        
         content, metadata = client.get_prompt_with_metadata(
             "onboarding-email",
             label="prod"
@@ -137,9 +162,9 @@ class TestSDKIntegration:
         assert "Hello {{user_name}}" in content
         assert metadata.version == 1
     
-    def test_context_manager_workflow(self, temp_dir, setup_prompts):
+    def test_context_manager_workflow(self, setup_prompts):
         """Test full workflow with context manager."""
-        with PromptClient(base_dir=temp_dir) as client:
+        with PromptClient(base_dir=setup_prompts) as client:
             # List prompts
             prompts = client.list_prompts()
             assert len(prompts) == 2
@@ -155,10 +180,8 @@ class TestSDKIntegration:
             stats = client.get_cache_stats()
             assert stats["cached_count"] == 1
     
-    def test_multiple_versions_workflow(self, temp_dir, setup_prompts):
+    def test_multiple_versions_workflow(self, client):
         """Test workflow with multiple versions."""
-        client = PromptClient(base_dir=temp_dir)
-        
         # Get specific versions
         v1 = client.get_prompt("onboarding-email", version=1)
         v2 = client.get_prompt("onboarding-email", version=2)
@@ -171,10 +194,8 @@ class TestSDKIntegration:
         stats = client.get_cache_stats()
         assert stats["cached_count"] == 2
     
-    def test_error_handling_workflow(self, temp_dir, setup_prompts):
+    def test_error_handling_workflow(self, client):
         """Test error handling in real workflow."""
-        client = PromptClient(base_dir=temp_dir)
-        
         # Non-existent prompt
         with pytest.raises(PromptNotFoundError):
             client.get_prompt("non-existent")
@@ -188,10 +209,8 @@ class TestSDKIntegration:
         with pytest.raises(ValueError):
             client.get_prompt("onboarding-email", label="prod", version=1)
     
-    def test_cache_invalidation_workflow(self, temp_dir, setup_prompts):
+    def test_cache_invalidation_workflow(self, client):
         """Test cache invalidation workflow."""
-        client = PromptClient(base_dir=temp_dir)
-        
         # Cache multiple prompts
         client.get_prompt("onboarding-email")
         client.get_prompt("reminder")
@@ -205,20 +224,20 @@ class TestSDKIntegration:
         client.get_prompt("onboarding-email")
         assert client.get_cache_stats()["cached_count"] == 1
     
-    def test_complex_variable_rendering(self, temp_dir, setup_prompts):
+    def test_complex_variable_rendering(self, tmp_path, setup_prompts):
         """Test complex variable rendering scenarios."""
-        # Create a prompt with multiple variables
-        manager = PromptManager()
-        manager.base_dir = temp_dir
-        manager.prompts_dir = temp_dir / "prompts"
-        manager.config_dir = temp_dir / ".config"
+        # Add a prompt to a private copy of the shared tree
+        shutil.copytree(setup_prompts, tmp_path, dirs_exist_ok=True)
         
-        manager.set_prompt(
+        client = PromptClient(base_dir=tmp_path)
+        
+        # Create a prompt with multiple variables through the client's own
+        # manager, which already points at the copy
+        client.manager.set_prompt(
             "complex",
             "Name: {{name}}\nAge: {{age}}\nCity: {{city}}"
         )
         
-        client = PromptClient(base_dir=temp_dir)
         content = client.get_prompt(
             "complex",
             variables={
@@ -232,10 +251,8 @@ class TestSDKIntegration:
         assert "Age: 30" in content
         assert "City: San Francisco" in content
     
-    def test_tag_manager_integration(self, temp_dir, setup_prompts):
+    def test_tag_manager_integration(self, client):
         """Test integration with TagManager."""
-        client = PromptClient(base_dir=temp_dir)
-        
         # Verify tag resolution works correctly
         prod_content = client.get_prompt("onboarding-email", label="prod")
         staging_content = client.get_prompt("onboarding-email", label="staging")
@@ -2,36 +2,18 @@
 Integration tests for test command.
 """
 
-import unittest
-import tempfile
-import os
-from pathlib import Path
+import shutil
+
+import pytest
 from unittest.mock import patch, MagicMock
 
 from promptv.manager import PromptManager
 from promptv.secrets_manager import SecretsManager
 from promptv.cli import cli
-from click.testing import CliRunner
-
 
-class TestTestCommandIntegration(unittest.TestCase):
-    """Integration tests for the test command."""
 
-    def setUp(self):
-        """Set up test environment with temporary directories."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.base_dir = Path(self.temp_dir) / ".promptv"
-        self.base_dir.mkdir(parents=True)
-        
-        self.runner = CliRunner()
-        
-        # Create minimal directory structure
-        (self.base_dir / "prompts").mkdir()
-        (self.base_dir / ".config").mkdir()
-        (self.base_dir / ".secrets").mkdir()
-        
-        # Create minimal config
-        config_content = """
+# Minimal config written into every test's .promptv/.config directory
+_CONFIG_YAML = """
 execution:
   mode: "local"
 cache:
@@ -45,15 +27,28 @@ llm_providers:
     api_base_url: "https://api.openai.com/v1"
     default_model: "gpt-4"
 """
-        with open(self.base_dir / ".config" / "config.yaml", 'w') as f:
-            f.write(config_content)
 
-    def tearDown(self):
-        """Clean up temporary directory."""
-        import shutil
-        shutil.rmtree(self.temp_dir)
 
-    def test_integration_test_command_end_to_end(self):
+@pytest.fixture(scope="session")
+def promptv_skeleton(tmp_path_factory):
+    """Build the minimal .promptv directory structure once per session."""
+    base_dir = tmp_path_factory.mktemp("skeleton") / ".promptv"
+    for subdir in ("prompts", ".config", ".secrets"):
+        (base_dir / subdir).mkdir(parents=True)
+    (base_dir / ".config" / "config.yaml").write_text(_CONFIG_YAML)
+    return base_dir
+
+
+class TestTestCommandIntegration:
+    """Integration tests for the test command."""
+
+    @pytest.fixture(autouse=True)
+    def setup_promptv_dir(self, tmp_path, promptv_skeleton):
+        """Set up test environment with a temporary .promptv directory."""
+        self.base_dir = tmp_path / ".promptv"
+        shutil.copytree(promptv_skeleton, self.base_dir)
+
+    def test_integration_test_command_end_to_end(self, runner):
         """Test full integration of test command with mocked API responses."""
         # Create a test prompt
         test_prompt_content = "# Test Prompt\n\nHello {{name}}!"
@@ -84,7 +79,7 @@ llm_providers:
             mock_interactive_tester.return_value = mock_tester
             
             # Run the command
-            result = self.runner.invoke(cli, [
+            result = runner.invoke(cli, [
                 'test', 'test-prompt',
                 '--llm', 'gpt-4',
                 '--provider', 'openai'
@@ -98,7 +93,3 @@ llm_providers:
             mock_secrets.get_api_key.assert_called_once_with('openai')
             mock_create_provider.assert_called_once_with('openai', 'gpt-4', 'test-api-key')
             mock_interactive_tester.assert_called_once()
-
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
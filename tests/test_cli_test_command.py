@@ -2,272 +2,167 @@
 Unit tests for CLI test command.
 """
 
-import unittest
-from unittest.mock import patch, MagicMock
-from click.testing import CliRunner
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock, call
 
 from promptv.cli import cli
+from promptv.manager import PromptManager
+from promptv.secrets_manager import SecretsManager
 
 
-class TestCLITestCommand(unittest.TestCase):
-    """Test suite for CLI test command."""
+CUSTOM_URL = 'https://api.example.com/v1/chat'
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
 
-    @patch('promptv.cli.PromptManager')
-    @patch('promptv.cli.SecretsManager')
-    def test_test_command_missing_required_args(self, mock_secrets, mock_manager):
-        """Test test command with missing required arguments."""
-        # Test missing --llm
-        result = self.runner.invoke(cli, ['test', 'test-prompt'])
-        self.assertNotEqual(result.exit_code, 0)
-        self.assertIn("Missing option '--llm'", result.output)
-        
-        # Test missing all provider options
-        result = self.runner.invoke(cli, ['test', 'test-prompt', '--llm', 'gpt-4'])
-        self.assertNotEqual(result.exit_code, 0)
-        self.assertIn("Either --provider, --endpoint, or --custom-endpoint must be specified", result.output)
+@pytest.fixture(scope="class")
+def patch_cli_collaborators(request):
+    """
+    Swap out everything the test command talks to, once per class.
 
-    @patch('promptv.cli.PromptManager')
-    @patch('promptv.cli.SecretsManager')
-    def test_test_command_mutual_exclusive_args(self, mock_secrets, mock_manager):
-        """Test test command with mutually exclusive arguments."""
-        # Test --provider and --endpoint together
-        result = self.runner.invoke(cli, [
-            'test', 'test-prompt', 
-            '--llm', 'gpt-4',
-            '--provider', 'openai',
-            '--endpoint', 'http://localhost:8000/v1'
-        ])
-        self.assertNotEqual(result.exit_code, 0)
-        self.assertIn("--provider, --endpoint, and --custom-endpoint are mutually exclusive", result.output)
-        
-        # Test --provider and --custom-endpoint together
-        result = self.runner.invoke(cli, [
-            'test', 'test-prompt', 
-            '--llm', 'gpt-4',
-            '--provider', 'openai',
-            '--custom-endpoint', 'https://api.example.com/v1/chat'
-        ])
-        self.assertNotEqual(result.exit_code, 0)
-        self.assertIn("--provider, --endpoint, and --custom-endpoint are mutually exclusive", result.output)
-        
-        # Test --endpoint and --custom-endpoint together
-        result = self.runner.invoke(cli, [
-            'test', 'test-prompt', 
-            '--llm', 'gpt-4',
-            '--endpoint', 'http://localhost:8000/v1',
-            '--custom-endpoint', 'https://api.example.com/v1/chat'
-        ])
-        self.assertNotEqual(result.exit_code, 0)
-        self.assertIn("--provider, --endpoint, and --custom-endpoint are mutually exclusive", result.output)
-
-    @patch('promptv.cli.PromptManager')
-    @patch('promptv.cli.SecretsManager')
-    def test_test_command_invalid_urls(self, mock_secrets, mock_manager):
-        """Test test command with invalid URLs."""
-        # Test invalid --endpoint URL
-        result = self.runner.invoke(cli, [
-            'test', 'test-prompt',
-            '--llm', 'gpt-4',
-            '--endpoint', 'invalid-url'
-        ])
-        self.assertNotEqual(result.exit_code, 0)
-        self.assertIn("Invalid URL format for --endpoint", result.output)
-        
-        # Test invalid --custom-endpoint URL
-        result = self.runner.invoke(cli, [
-            'test', 'test-prompt',
-            '--llm', 'gpt-4',
-            '--custom-endpoint', 'invalid-url'
-        ])
-        self.assertNotEqual(result.exit_code, 0)
-        self.assertIn("Invalid URL format for --custom-endpoint", result.output)
+    The managers, provider creation and the interactive session are
+    patched for the whole class and the mocks stored on it, which also
+    keeps every test away from real prompt and secret storage;
+    wired_mocks resets them between tests.
+    """
+    with patch('promptv.cli.PromptManager') as manager_class, \
+         patch('promptv.cli.SecretsManager') as secrets_class, \
+         patch('promptv.cli.create_provider') as create_provider, \
+         patch('promptv.cli.InteractiveTester') as tester:
+        request.cls.mock_manager = manager_class
+        request.cls.mock_secrets = secrets_class
+        request.cls.mock_create_provider = create_provider
+        request.cls.mock_tester = tester
+        yield
 
-    @patch('promptv.cli.PromptManager')
-    @patch('promptv.cli.SecretsManager')
-    def test_test_command_invalid_temperature(self, mock_secrets, mock_manager):
-        """Test test command with invalid temperature."""
-        result = self.runner.invoke(cli, [
-            'test', 'test-prompt',
-            '--llm', 'gpt-4',
-            '--provider', 'openai',
-            '--temperature', '3.0'  # Too high
-        ])
-        self.assertNotEqual(result.exit_code, 0)
-        self.assertIn("Temperature must be between 0.0 and 2.0", result.output)
 
-    @patch('promptv.cli.PromptManager')
-    @patch('promptv.cli.SecretsManager')
-    def test_test_command_invalid_max_tokens(self, mock_secrets, mock_manager):
-        """Test test command with invalid max tokens."""
-        result = self.runner.invoke(cli, [
-            'test', 'test-prompt',
-            '--llm', 'gpt-4',
-            '--provider', 'openai',
-            '--max-tokens', '0'  # Not positive
-        ])
-        self.assertNotEqual(result.exit_code, 0)
-        self.assertIn("Max tokens must be positive", result.output)
+@pytest.mark.usefixtures("patch_cli_collaborators")
+class TestCLITestCommand:
+    """Test suite for CLI test command."""
 
-    @patch('promptv.cli.PromptManager')
-    @patch('promptv.cli.SecretsManager')
-    def test_test_command_prompt_not_found(self, mock_secrets, mock_manager):
+    @pytest.fixture
+    def wired_mocks(self):
+        """
+        Wire up mocks for a found prompt with a stored API key.
+
+        The manager and secrets mocks are spec'd to the real classes, so
+        they only grow child mocks for attributes that actually exist.
+        """
+        # Forget calls made by earlier tests on the class-wide mocks
+        for class_mock in (self.mock_manager, self.mock_secrets,
+                           self.mock_create_provider, self.mock_tester):
+            class_mock.reset_mock()
+
+        manager = MagicMock(spec=PromptManager)
+        manager.prompt_exists.return_value = True
+        manager.get_prompt.return_value = "Test prompt content"
+        manager.extract_variables.return_value = []
+        self.mock_manager.return_value = manager
+
+        secrets = MagicMock(spec=SecretsManager)
+        secrets.get_api_key.return_value = "secret-api-key"
+        self.mock_secrets.return_value = secrets
+
+        return SimpleNamespace(
+            manager=manager,
+            secrets=secrets,
+            create_provider=self.mock_create_provider,
+            tester=self.mock_tester
+        )
+
+    @pytest.mark.parametrize("args,expected", [
+        ([], "Missing option '--llm'"),
+        (['--llm', 'gpt-4'],
+         "Either --provider, --endpoint, or --custom-endpoint must be specified"),
+        (['--llm', 'gpt-4', '--provider', 'openai', '--endpoint', 'http://localhost:8000/v1'],
+         "--provider, --endpoint, and --custom-endpoint are mutually exclusive"),
+        (['--llm', 'gpt-4', '--provider', 'openai', '--custom-endpoint', CUSTOM_URL],
+         "--provider, --endpoint, and --custom-endpoint are mutually exclusive"),
+        (['--llm', 'gpt-4', '--endpoint', 'http://localhost:8000/v1', '--custom-endpoint', CUSTOM_URL],
+         "--provider, --endpoint, and --custom-endpoint are mutually exclusive"),
+        (['--llm', 'gpt-4', '--endpoint', 'invalid-url'],
+         "Invalid URL format for --endpoint"),
+        (['--llm', 'gpt-4', '--custom-endpoint', 'invalid-url'],
+         "Invalid URL format for --custom-endpoint"),
+        (['--llm', 'gpt-4', '--provider', 'openai', '--temperature', '3.0'],  # Too high
+         "Temperature must be between 0.0 and 2.0"),
+        (['--llm', 'gpt-4', '--provider', 'openai', '--max-tokens', '0'],  # Not positive
+         "Max tokens must be positive"),
+    ], ids=[
+        "missing-llm",
+        "missing-provider",
+        "provider-and-endpoint",
+        "provider-and-custom-endpoint",
+        "endpoint-and-custom-endpoint",
+        "invalid-endpoint-url",
+        "invalid-custom-endpoint-url",
+        "invalid-temperature",
+        "invalid-max-tokens",
+    ])
+    def test_test_command_validation_errors(self, runner, args, expected):
+        """Test that invalid option combinations are rejected."""
+        result = runner.invoke(cli, ['test', 'test-prompt', *args])
+        assert result.exit_code != 0
+        assert expected in result.output
+
+    def test_test_command_prompt_not_found(self, runner, wired_mocks):
         """Test test command when prompt is not found."""
-        mock_manager_instance = MagicMock()
-        mock_manager_instance.prompt_exists.return_value = False
-        mock_manager.return_value = mock_manager_instance
-        
-        result = self.runner.invoke(cli, [
+        wired_mocks.manager.prompt_exists.return_value = False
+
+        result = runner.invoke(cli, [
             'test', 'nonexistent-prompt',
             '--llm', 'gpt-4',
             '--provider', 'openai'
         ])
-        self.assertNotEqual(result.exit_code, 0)
-        self.assertIn("Prompt 'nonexistent-prompt' not found", result.output)
+        assert result.exit_code != 0
+        assert "Prompt 'nonexistent-prompt' not found" in result.output
 
-    @patch('promptv.cli.PromptManager')
-    @patch('promptv.cli.SecretsManager')
-    @patch('promptv.cli.create_provider')
-    def test_test_command_api_key_not_found(self, mock_create_provider, mock_secrets, mock_manager):
+    def test_test_command_api_key_not_found(self, runner, wired_mocks):
         """Test test command when API key is not found."""
-        # Setup mocks
-        mock_manager_instance = MagicMock()
-        mock_manager_instance.prompt_exists.return_value = True
-        mock_manager_instance.get_prompt.return_value = "Test prompt content"
-        mock_manager_instance.extract_variables.return_value = []
-        mock_manager.return_value = mock_manager_instance
-        
-        mock_secrets_instance = MagicMock()
-        mock_secrets_instance.get_api_key.return_value = None
-        mock_secrets.return_value = mock_secrets_instance
-        
-        result = self.runner.invoke(cli, [
-            'test', 'test-prompt',
-            '--llm', 'gpt-4',
-            '--provider', 'openai'
-        ])
-        self.assertNotEqual(result.exit_code, 0)
-        self.assertIn("API key not found for provider 'openai'", result.output)
-
-    @patch('promptv.cli.PromptManager')
-    @patch('promptv.cli.SecretsManager')
-    @patch('promptv.cli.create_provider')
-    @patch('promptv.cli.InteractiveTester')
-    def test_test_command_success_with_custom_endpoint_and_api_key(self, mock_interactive_tester, mock_create_provider, mock_secrets, mock_manager):
-        """Test successful test command execution with custom endpoint and API key."""
-        # Setup mocks
-        mock_manager_instance = MagicMock()
-        mock_manager_instance.prompt_exists.return_value = True
-        mock_manager_instance.get_prompt.return_value = "Test prompt content"
-        mock_manager_instance.extract_variables.return_value = []
-        mock_manager.return_value = mock_manager_instance
-        
-        mock_secrets_instance = MagicMock()
-        mock_secrets_instance.get_api_key.return_value = "secret-api-key"
-        mock_secrets.return_value = mock_secrets_instance
-        
-        mock_provider_instance = MagicMock()
-        mock_create_provider.return_value = mock_provider_instance
-        
-        mock_tester_instance = MagicMock()
-        mock_interactive_tester.return_value = mock_tester_instance
-        
-        result = self.runner.invoke(cli, [
-            'test', 'test-prompt',
-            '--llm', 'my-model',
-            '--custom-endpoint', 'https://api.example.com/v1/chat',
-            '--api-key', 'direct-api-key'
-        ])
-        
-        # Should exit normally (we can't easily test the interactive session)
-        # But we can verify the mocks were called correctly
-        mock_manager_instance.prompt_exists.assert_called_once_with('test-prompt', project='default')
-        mock_manager_instance.get_prompt.assert_called_once_with('test-prompt', project='default')
-        # Should not call secrets manager when api-key is provided directly
-        mock_secrets_instance.get_api_key.assert_not_called()
-        mock_create_provider.assert_called_once_with('custom', 'my-model', 'direct-api-key', 'https://api.example.com/v1/chat')
-        mock_interactive_tester.assert_called_once()
-        
-        # Should show security warning
-        self.assertIn("Warning: Using --api-key exposes your API key", result.output)
+        wired_mocks.secrets.get_api_key.return_value = None
 
-    @patch('promptv.cli.PromptManager')
-    @patch('promptv.cli.SecretsManager')
-    @patch('promptv.cli.create_provider')
-    @patch('promptv.cli.InteractiveTester')
-    def test_test_command_success_with_custom_endpoint_only(self, mock_interactive_tester, mock_create_provider, mock_secrets, mock_manager):
-        """Test successful test command execution with custom endpoint only."""
-        # Setup mocks
-        mock_manager_instance = MagicMock()
-        mock_manager_instance.prompt_exists.return_value = True
-        mock_manager_instance.get_prompt.return_value = "Test prompt content"
-        mock_manager_instance.extract_variables.return_value = []
-        mock_manager.return_value = mock_manager_instance
-        
-        mock_secrets_instance = MagicMock()
-        mock_secrets_instance.get_api_key.return_value = "secret-api-key"
-        mock_secrets.return_value = mock_secrets_instance
-        
-        mock_provider_instance = MagicMock()
-        mock_create_provider.return_value = mock_provider_instance
-        
-        mock_tester_instance = MagicMock()
-        mock_interactive_tester.return_value = mock_tester_instance
-        
-        result = self.runner.invoke(cli, [
-            'test', 'test-prompt',
-            '--llm', 'my-model',
-            '--custom-endpoint', 'https://api.example.com/v1/chat'
-        ])
-        
-        # Should exit normally
-        mock_manager_instance.prompt_exists.assert_called_once_with('test-prompt', project='default')
-        mock_manager_instance.get_prompt.assert_called_once_with('test-prompt', project='default')
-        # Should call secrets manager when no api-key is provided
-        mock_secrets_instance.get_api_key.assert_called_once_with('custom')
-        mock_create_provider.assert_called_once_with('custom', 'my-model', 'secret-api-key', 'https://api.example.com/v1/chat')
-        mock_interactive_tester.assert_called_once()
-
-    @patch('promptv.cli.PromptManager')
-    @patch('promptv.cli.SecretsManager')
-    @patch('promptv.cli.create_provider')
-    @patch('promptv.cli.InteractiveTester')
-    def test_test_command_success(self, mock_interactive_tester, mock_create_provider, mock_secrets, mock_manager):
-        """Test successful test command execution."""
-        # Setup mocks
-        mock_manager_instance = MagicMock()
-        mock_manager_instance.prompt_exists.return_value = True
-        mock_manager_instance.get_prompt.return_value = "Test prompt content"
-        mock_manager_instance.extract_variables.return_value = []
-        mock_manager.return_value = mock_manager_instance
-        
-        mock_secrets_instance = MagicMock()
-        mock_secrets_instance.get_api_key.return_value = "test-api-key"
-        mock_secrets.return_value = mock_secrets_instance
-        
-        mock_provider_instance = MagicMock()
-        mock_create_provider.return_value = mock_provider_instance
-        
-        mock_tester_instance = MagicMock()
-        mock_interactive_tester.return_value = mock_tester_instance
-        
-        result = self.runner.invoke(cli, [
+        result = runner.invoke(cli, [
             'test', 'test-prompt',
             '--llm', 'gpt-4',
             '--provider', 'openai'
         ])
-        
-        # Should exit normally (we can't easily test the interactive session)
-        # But we can verify the mocks were called correctly
-        mock_manager_instance.prompt_exists.assert_called_once_with('test-prompt', project='default')
-        mock_manager_instance.get_prompt.assert_called_once_with('test-prompt', project='default')
-        mock_secrets_instance.get_api_key.assert_called_once_with('openai')
-        mock_create_provider.assert_called_once_with('openai', 'gpt-4', 'test-api-key')
-        mock_interactive_tester.assert_called_once()
+        assert result.exit_code != 0
+        assert "API key not found for provider 'openai'" in result.output
+        wired_mocks.create_provider.assert_not_called()
+
+    @pytest.mark.parametrize("args,key_lookup,provider_args", [
+        (['--llm', 'gpt-4', '--provider', 'openai'],
+         'openai', ('openai', 'gpt-4', 'secret-api-key')),
+        (['--llm', 'my-model', '--custom-endpoint', CUSTOM_URL],
+         'custom', ('custom', 'my-model', 'secret-api-key', CUSTOM_URL)),
+        # A key passed with --api-key bypasses the secrets manager
+        (['--llm', 'my-model', '--custom-endpoint', CUSTOM_URL, '--api-key', 'direct-api-key'],
+         None, ('custom', 'my-model', 'direct-api-key', CUSTOM_URL)),
+    ], ids=["provider", "custom-endpoint", "custom-endpoint-with-api-key"])
+    def test_test_command_success(self, runner, wired_mocks, args, key_lookup, provider_args):
+        """Test successful test command setup for each way of choosing a provider."""
+        result = runner.invoke(cli, ['test', 'test-prompt', *args])
 
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+        # Should exit normally (we can't easily test the interactive session)
+        # But we can verify the exact interactions with each mock
+        assert wired_mocks.manager.method_calls == [
+            call.prompt_exists('test-prompt', project='default'),
+            call.get_prompt('test-prompt', project='default'),
+            call.extract_variables("Test prompt content"),
+        ]
+        if key_lookup is None:
+            assert wired_mocks.secrets.method_calls == []
+            # Should show security warning
+            assert "Warning: Using --api-key exposes your API key" in result.output
+        else:
+            assert wired_mocks.secrets.method_calls == [call.get_api_key(key_lookup)]
+        assert wired_mocks.create_provider.call_args_list == [call(*provider_args)]
+        assert wired_mocks.tester.mock_calls == [
+            call(
+                provider=wired_mocks.create_provider.return_value,
+                initial_prompt="Test prompt content",
+                show_costs=True,
+                temperature=None,
+                max_tokens=None
+            ),
+            call().start_session(),
+        ]
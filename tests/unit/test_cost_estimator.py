@@ -56,6 +56,49 @@ class TestCostEstimator:
         assert 'openai' in estimator.pricing
         assert 'anthropic' in estimator.pricing
     
+    def test_pricing_data_parsed_once(self, temp_home, monkeypatch):
+        """Test that unchanged pricing.yaml is not re-parsed."""
+        from promptv import resources
+        
+        pricing_file = temp_home / ".promptv" / ".config" / "pricing.yaml"
+        pricing_file.parent.mkdir(parents=True)
+        pricing_file.write_text("openai:\n  gpt-4: {input: 1, output: 2}\n")
+        
+        parses = []
+        real_load = resources.safe_load_yaml
+        monkeypatch.setattr(
+            resources, "safe_load_yaml", lambda f: parses.append(1) or real_load(f)
+        )
+        
+        first = resources.load_pricing_data()
+        second = resources.load_pricing_data()
+        assert first == second
+        assert second['_source']['is_user_config'] is True
+        assert len(parses) == 1
+        
+        # Changing the file invalidates the cached parse
+        pricing_file.write_text("openai:\n  gpt-4: {input: 3, output: 4, encoding: x}\n")
+        assert resources.load_pricing_data()['openai']['gpt-4']['input'] == 3
+        assert len(parses) == 2
+    
+    def test_user_pricing_in_relocated_base_dir(self, tmp_path, monkeypatch):
+        """Test that a user pricing file is recognized outside ~/.promptv."""
+        from promptv import resources
+        
+        monkeypatch.setenv("PROMPTV_BASE_DIR", str(tmp_path / "data"))
+        pricing_file = tmp_path / "data" / ".config" / "pricing.yaml"
+        pricing_file.parent.mkdir(parents=True)
+        pricing_file.write_text("openai:\n  gpt-4: {input: 1, output: 2}\n")
+        
+        data = resources.load_pricing_data()
+        assert data['_source'] == {'path': str(pricing_file), 'is_user_config': True}
+        
+        # A corrupt user file falls back to the bundled pricing
+        pricing_file.write_text("openai: [unclosed\n")
+        data = resources.load_pricing_data()
+        assert data['_source']['is_user_config'] is False
+        assert data['_source']['path'] != str(pricing_file)
+    
     def test_count_tokens_simple(self, estimator):
         """Test token counting for simple text."""
         text = "Hello, world!"
@@ -92,6 +135,73 @@ class TestCostEstimator:
         
         assert encoder_before is encoder_after  # Same object
     
+    def test_count_tokens_result_caching(self, monkeypatch):
+        """Test that repeat counts of the same text skip tokenization."""
+        from promptv import cost_estimator
+        
+        class CountingEncoder:
+            calls = 0
+            
+            def encode(self, text):
+                CountingEncoder.calls += 1
+                return text.split()
+        
+        encoder = CountingEncoder()
+        monkeypatch.setattr(cost_estimator.tiktoken, "get_encoding", lambda name: encoder)
+        
+        text = "Cached token count text"
+        first = CostEstimator(pricing_data=MOCK_PRICING)
+        assert first.count_tokens(text, model="gpt-4", provider="openai") == 4
+        
+        # Different instance and model, same encoding: served from cache
+        second = CostEstimator(pricing_data=MOCK_PRICING)
+        assert second.count_tokens(text, model="gpt-3.5-turbo", provider="openai") == 4
+        assert CountingEncoder.calls == 1
+    
+    def test_token_count_cache_is_bounded_and_keyed_by_digest(self, monkeypatch):
+        """Test that the token count cache holds digests, not prompt text, and evicts LRU."""
+        from promptv import cost_estimator
+        
+        class WordEncoder:
+            def encode(self, text):
+                return text.split()
+        
+        monkeypatch.setattr(cost_estimator, "TOKEN_COUNT_CACHE_SIZE", 2)
+        monkeypatch.setattr(cost_estimator, "_TOKEN_COUNT_CACHE", cost_estimator.OrderedDict())
+        encoder = WordEncoder()
+        
+        for text in ("alpha " * 500, "beta " * 600, "gamma " * 700):
+            cost_estimator._cached_token_count(encoder, text)
+        
+        # The oldest count was evicted; keys are 16-byte digests
+        cache = cost_estimator._TOKEN_COUNT_CACHE
+        assert list(cache.values()) == [600, 700]
+        assert all(key_encoder is encoder and len(digest) == 16 for key_encoder, digest in cache)
+        
+        # Lone surrogates (which tiktoken accepts) can still be hashed
+        assert cost_estimator._cached_token_count(encoder, "a \ud800 b") == 3
+    
+    def test_count_version_tokens_reuses_stored_count(self, estimator, monkeypatch):
+        """Test that a stored count is reused only for a matching encoding."""
+        from datetime import datetime
+        from promptv import cost_estimator
+        from promptv.models import VersionMetadata
+        
+        monkeypatch.setattr(cost_estimator.tiktoken, "get_encoding", lambda name: object())
+        monkeypatch.setattr(cost_estimator, "_cached_token_count", lambda encoder, text: 99)
+        version_meta = VersionMetadata(
+            version=1, timestamp=datetime.now(), file_path="v1.md",
+            token_count=7, token_encoding=estimator.get_encoding_name("gpt-4", "openai")
+        )
+        
+        assert estimator.count_version_tokens(version_meta, "text", "gpt-4", "openai") == 7
+        
+        # Estimated (no encoding) or differently-encoded counts are recomputed
+        version_meta.token_encoding = None
+        assert estimator.count_version_tokens(version_meta, "text", "gpt-4", "openai") == 99
+        version_meta.token_encoding = "other_base"
+        assert estimator.count_version_tokens(version_meta, "text", "gpt-4", "openai") == 99
+    
     def test_count_tokens_unknown_model(self, estimator):
         """Test token counting with unknown model."""
         with pytest.raises(UnknownModelError):
@@ -0,0 +1,49 @@
+"""
+Unit tests for promptv.paths.
+"""
+import threading
+
+from promptv.paths import base_dir_override, get_base_dir
+
+
+class TestGetBaseDir:
+    """Tests for base directory resolution."""
+    
+    def test_defaults_to_home(self, temp_home, monkeypatch):
+        """Test that ~/.promptv is used without an override."""
+        monkeypatch.delenv("PROMPTV_BASE_DIR", raising=False)
+        assert get_base_dir() == temp_home / ".promptv"
+    
+    def test_env_override(self, tmp_path, monkeypatch):
+        """Test that PROMPTV_BASE_DIR takes precedence."""
+        monkeypatch.setenv("PROMPTV_BASE_DIR", str(tmp_path / "data"))
+        assert get_base_dir() == tmp_path / "data"
+    
+    def test_follows_env_changes(self, tmp_path, monkeypatch):
+        """Test that each lookup reflects the current environment."""
+        monkeypatch.setenv("PROMPTV_BASE_DIR", str(tmp_path / "a"))
+        assert get_base_dir() == tmp_path / "a"
+        
+        monkeypatch.setenv("PROMPTV_BASE_DIR", str(tmp_path / "b"))
+        assert get_base_dir() == tmp_path / "b"
+    
+    def test_override_takes_precedence_and_resets(self, tmp_path, monkeypatch):
+        """Test that base_dir_override beats the env var only inside the block."""
+        monkeypatch.setenv("PROMPTV_BASE_DIR", str(tmp_path / "env"))
+        
+        with base_dir_override(tmp_path / "override"):
+            assert get_base_dir() == tmp_path / "override"
+        
+        assert get_base_dir() == tmp_path / "env"
+    
+    def test_override_is_not_visible_to_other_threads(self, tmp_path, monkeypatch):
+        """Test that an override does not leak into concurrently running threads."""
+        monkeypatch.setenv("PROMPTV_BASE_DIR", str(tmp_path / "env"))
+        seen = []
+        
+        with base_dir_override(tmp_path / "override"):
+            thread = threading.Thread(target=lambda: seen.append(get_base_dir()))
+            thread.start()
+            thread.join()
+        
+        assert seen == [tmp_path / "env"]
@@ -6,6 +6,7 @@ import pytest
 import tempfile
 import shutil
 from pathlib import Path
+from promptv import secrets_manager
 from promptv.secrets_manager import (
     SecretsManager,
     SecretsManagerError
@@ -29,6 +30,29 @@ class TestSecretsManager:
         assert len(manager.SUPPORTED_PROVIDERS) > 0
         assert (temp_secrets_dir / "secrets.json").exists()
     
+    def test_init_reuses_existing_storage(self, temp_secrets_dir):
+        """Test that re-initializing keeps existing secrets and fixes permissions."""
+        manager = SecretsManager(secrets_dir=temp_secrets_dir)
+        manager.set_api_key("openai", "sk-test")
+        manager.secrets_file.chmod(0o644)
+        
+        reopened = SecretsManager(secrets_dir=temp_secrets_dir)
+        assert reopened.get_api_key("openai") == "sk-test"
+        assert reopened.secrets_file.stat().st_mode & 0o777 == 0o600
+    
+    def test_lazy_init_defers_storage(self, tmp_path):
+        """Test that lazy_init creates nothing until the first write."""
+        secrets_dir = tmp_path / ".secrets"
+        manager = SecretsManager(secrets_dir=secrets_dir, lazy_init=True)
+        
+        assert manager.get_api_key("openai") is None
+        assert manager.list_configured_providers() == []
+        assert not secrets_dir.exists()
+        
+        manager.set_api_key("openai", "sk-test")
+        assert manager.secrets_file.stat().st_mode & 0o777 == 0o600
+        assert manager.get_api_key("openai") == "sk-test"
+    
     def test_set_api_key_success(self, temp_secrets_dir):
         """Test setting an API key."""
         manager = SecretsManager(secrets_dir=temp_secrets_dir)
@@ -96,6 +120,18 @@ class TestSecretsManager:
         # Should not raise an exception
         manager.delete_api_key("openai")
     
+    def test_delete_missing_key_does_not_rewrite_file(self, temp_secrets_dir):
+        """Test that deleting absent keys leaves the secrets file untouched."""
+        manager = SecretsManager(secrets_dir=temp_secrets_dir)
+        manager.set_api_key("openai", "sk-test")
+        before = manager.secrets_file.stat().st_mtime_ns
+        
+        manager.delete_api_key("anthropic")
+        manager.delete_secret("MISSING", project="my-app")
+        
+        assert manager.secrets_file.stat().st_mtime_ns == before
+        assert manager.get_api_key("openai") == "sk-test"
+    
     def test_list_configured_providers(self, temp_secrets_dir):
         """Test listing configured providers."""
         manager = SecretsManager(secrets_dir=temp_secrets_dir)
@@ -155,8 +191,128 @@ class TestSecretsManager:
         manager.set_api_key("openai", "sk-test")
         
         mode = manager.secrets_file.stat().st_mode
-        permissions = oct(mode)[-3:]
-        assert permissions == "600"
+        assert mode & 0o777 == 0o600
+    
+    def test_cache_shared_across_instances(self, temp_secrets_dir):
+        """Test that instances for the same path see each other's writes."""
+        first = SecretsManager(secrets_dir=temp_secrets_dir)
+        second = SecretsManager(secrets_dir=temp_secrets_dir)
+        
+        first.set_api_key("openai", "sk-test")
+        assert second.get_api_key("openai") == "sk-test"
+    
+    def test_cache_reloads_on_external_change(self, temp_secrets_dir):
+        """Test that edits made outside the manager are picked up."""
+        manager = SecretsManager(secrets_dir=temp_secrets_dir)
+        manager.set_api_key("openai", "sk-test")
+        
+        manager.secrets_file.write_text('{"openai": "sk-changed-externally"}')
+        assert manager.get_api_key("openai") == "sk-changed-externally"
+    
+    def test_clear_cache(self, temp_secrets_dir):
+        """Test that clear_cache forces the next read to reparse the file."""
+        manager = SecretsManager(secrets_dir=temp_secrets_dir)
+        manager.set_api_key("openai", "sk-test")
+        
+        manager.clear_cache()
+        assert manager.secrets_file not in SecretsManager._shared_cache
+        assert manager.get_api_key("openai") == "sk-test"
+    
+    def test_batch_writes_once(self, temp_secrets_dir):
+        """Test that mutations inside batch() are written on exit only."""
+        manager = SecretsManager(secrets_dir=temp_secrets_dir)
+        manager.set_api_key("openai", "sk-test")
+        before = manager.secrets_file.read_text()
+        
+        with manager.batch():
+            manager.set_secret("DATABASE_URL", "postgres://db", project="app1")
+            manager.set_secret("REDIS_URL", "redis://localhost", project="app1")
+            manager.delete_api_key("openai")
+            assert manager.get_secret("REDIS_URL", project="app1") == "redis://localhost"
+            assert manager.secrets_file.read_text() == before
+        
+        reopened = SecretsManager(secrets_dir=temp_secrets_dir)
+        reopened.clear_cache()
+        assert reopened.get_secret("DATABASE_URL", project="app1") == "postgres://db"
+        assert reopened.get_secret("REDIS_URL", project="app1") == "redis://localhost"
+        assert reopened.get_api_key("openai") is None
+    
+    def test_batch_discards_changes_on_error(self, temp_secrets_dir):
+        """Test that a failing batch() leaves stored secrets unchanged."""
+        manager = SecretsManager(secrets_dir=temp_secrets_dir)
+        manager.set_api_key("openai", "sk-test")
+        
+        with pytest.raises(RuntimeError):
+            with manager.batch():
+                manager.set_api_key("openai", "sk-other")
+                raise RuntimeError("boom")
+        
+        assert manager.get_api_key("openai") == "sk-test"
+    
+    def test_set_secrets_bulk(self, temp_secrets_dir, monkeypatch):
+        """Test storing several secrets and API keys with one write each."""
+        manager = SecretsManager(secrets_dir=temp_secrets_dir)
+        saves = []
+        original_mkstemp = secrets_manager.tempfile.mkstemp
+        
+        def counting_mkstemp(*args, **kwargs):
+            saves.append(1)
+            return original_mkstemp(*args, **kwargs)
+        
+        monkeypatch.setattr(secrets_manager.tempfile, "mkstemp", counting_mkstemp)
+        
+        manager.set_api_keys_bulk({"openai": "sk-openai", "anthropic": "sk-ant"})
+        manager.set_secrets_bulk(
+            {"DATABASE_URL": "postgres://db", "REDIS_URL": "redis://localhost"}, project="app1"
+        )
+        
+        assert len(saves) == 2
+        reopened = SecretsManager(secrets_dir=temp_secrets_dir)
+        reopened.clear_cache()
+        assert reopened.get_api_key("anthropic") == "sk-ant"
+        assert reopened.get_secret("REDIS_URL", project="app1") == "redis://localhost"
+    
+    def test_set_secrets_bulk_is_all_or_nothing(self, temp_secrets_dir):
+        """Test that one invalid entry stores none of the bulk secrets."""
+        manager = SecretsManager(secrets_dir=temp_secrets_dir)
+        
+        with pytest.raises(ValueError):
+            manager.set_secrets_bulk({"DATABASE_URL": "postgres://db", "EMPTY": ""})
+        with pytest.raises(ValueError):
+            manager.set_api_keys_bulk({"openai": "sk-openai", "unknown": "key"})
+        
+        assert manager.get_secret("DATABASE_URL") is None
+        assert manager.get_api_key("openai") is None
+    
+    def test_failed_write_leaves_shared_cache_untouched(self, temp_secrets_dir, monkeypatch):
+        """Test that a set that never reaches disk is not visible to readers."""
+        manager = SecretsManager(secrets_dir=temp_secrets_dir)
+        manager.set_secret("DATABASE_URL", "postgres://db")
+        
+        def fail(*args, **kwargs):
+            raise SecretsManagerError("storage unavailable")
+        monkeypatch.setattr(manager, "_ensure_initialized", fail)
+        
+        with pytest.raises(SecretsManagerError):
+            manager.set_secret("REDIS_URL", "redis://localhost")
+        with pytest.raises(SecretsManagerError):
+            manager.delete_secret("DATABASE_URL")
+        
+        reader = SecretsManager(secrets_dir=temp_secrets_dir)
+        assert reader.get_secret("REDIS_URL") is None
+        assert reader.get_secret("DATABASE_URL") == "postgres://db"
+    
+    def test_explicit_project_overrides_context(self, temp_secrets_dir):
+        """Test that a project argument takes precedence over set_project."""
+        manager = SecretsManager(secrets_dir=temp_secrets_dir)
+        manager.set_project("app1")
+        
+        manager.set_secret("DATABASE_URL", "postgres://db1")
+        manager.set_secret("DATABASE_URL", "postgres://db2", project="app2")
+        
+        assert manager.project == "app1"
+        assert manager.get_secret("DATABASE_URL") == "postgres://db1"
+        assert manager.get_secret("DATABASE_URL", project="app2") == "postgres://db2"
     
     def test_get_project_secrets_with_values_default(self, temp_secrets_dir):
         """Test getting secrets for default project with values."""
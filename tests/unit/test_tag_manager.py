@@ -167,6 +167,34 @@ class TestCreateTag:
         assert data["prompt_name"] == sample_prompt
         assert "prod" in data["tags"]
         assert data["tags"]["prod"]["version"] == 2
+    
+    def test_create_tags_writes_once(self, tag_manager, sample_prompt, monkeypatch):
+        """Test creating several tags with a single tags.json write."""
+        saves = []
+        original_save = tag_manager._save_tags
+        monkeypatch.setattr(
+            tag_manager, "_save_tags",
+            lambda registry, project=None: (saves.append(registry), original_save(registry, project=project))
+        )
+        
+        created = tag_manager.create_tags(sample_prompt, {"prod": 1, "staging": 2})
+        
+        assert len(saves) == 1
+        assert {name: tag.version for name, tag in created.items()} == {"prod": 1, "staging": 2}
+        tags = tag_manager.list_tags(sample_prompt)
+        assert tags["prod"].version == 1
+        assert tags["staging"].version == 2
+    
+    def test_create_tags_duplicate_writes_nothing(self, tag_manager, sample_prompt):
+        """Test that one duplicate tag leaves the registry unchanged."""
+        tag_manager.create_tag(prompt_name=sample_prompt, tag_name="prod", version=1)
+        
+        with pytest.raises(TagAlreadyExistsError):
+            tag_manager.create_tags(sample_prompt, {"staging": 2, "prod": 3})
+        
+        tags = tag_manager.list_tags(sample_prompt)
+        assert list(tags) == ["prod"]
+        assert tags["prod"].version == 1
 
 
 class TestGetTag:
@@ -361,6 +389,34 @@ class TestTagsPersistence:
         assert registry.tags["prod"].version == 2
         assert registry.tags["staging"].version == 3
     
+    def test_load_tags_uses_cache(self, tag_manager, sample_prompt):
+        """Test that unchanged tags.json is not reparsed."""
+        tag_manager.create_tag(sample_prompt, "prod", 2)
+        
+        assert tag_manager._load_tags(sample_prompt) is tag_manager._load_tags(sample_prompt)
+    
+    def test_load_tags_sees_external_change(self, tag_manager, sample_prompt, temp_prompts_dir):
+        """Test that edits to tags.json invalidate the cached registry."""
+        tag_manager.create_tag(sample_prompt, "prod", 2)
+        tag_manager.get_tag(sample_prompt, "prod")
+        
+        tags_file = temp_prompts_dir / sample_prompt / "tags.json"
+        data = json.loads(tags_file.read_text())
+        data["tags"]["prod"]["version"] = 3
+        tags_file.write_text(json.dumps(data, indent=2))
+        
+        assert tag_manager.get_tag(sample_prompt, "prod").version == 3
+    
+    def test_registry_cache_is_bounded(self, tag_manager, temp_prompts_dir, monkeypatch):
+        """Test that the registry cache evicts least recently used prompts."""
+        monkeypatch.setattr(TagManager, "REGISTRY_CACHE_SIZE", 2)
+        for name in ("p1", "p2", "p3"):
+            (temp_prompts_dir / name).mkdir()
+            tag_manager.create_tag(name, "prod", 1)
+        
+        assert list(tag_manager._registry_cache) == [("p2", None), ("p3", None)]
+        assert tag_manager.get_tag("p1", "prod").version == 1
+    
     def test_tags_file_format(self, tag_manager, sample_prompt, temp_prompts_dir):
         """Test that tags.json has correct format."""
         tag_manager.create_tag(sample_prompt, "prod", 2, "Production")
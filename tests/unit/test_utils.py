@@ -0,0 +1,122 @@
+"""
+Unit tests for promptv.utils output helpers.
+"""
+import io
+import sys
+
+import pytest
+from unittest.mock import MagicMock
+
+from promptv import utils
+from promptv.models import CostEstimate
+from promptv.utils import confirm_cost, format_cost_comparison
+
+
+def _estimate(total):
+    """Build a CostEstimate whose cost splits evenly between input and output."""
+    return CostEstimate(
+        input_tokens=10, estimated_output_tokens=100, total_tokens=110,
+        input_cost=total / 2, estimated_output_cost=total / 2,
+        total_cost=total, model="m", provider="p"
+    )
+
+
+class TestFormatCostComparison:
+    """Tests for format_cost_comparison."""
+    
+    def test_plain_output(self, capsys):
+        """Test the plain-text cost comparison table."""
+        format_cost_comparison(
+            {"openai/gpt-4": _estimate(0.01), "openai/gpt-3.5-turbo": _estimate(0.001), "x/y": None},
+            plain=True
+        )
+        output = capsys.readouterr().out
+        
+        lines = output.splitlines()
+        assert "\x1b[" not in output
+        assert lines[0] == "Warning: Could not estimate cost for:"
+        assert lines[3].startswith("Provider/Model")
+        assert lines[5].startswith("openai/gpt-3.5-turbo")
+        assert lines[6].startswith("openai/gpt-4 ")
+        assert lines[-1] == "Cheapest option: openai/gpt-3.5-turbo at $0.001000"
+
+
+class _TerminalStream(io.StringIO):
+    """In-memory stream that claims to be a terminal."""
+    
+    def isatty(self):
+        return True
+
+
+class TestConsoleOutput:
+    """Tests for the helpers' Rich console handling."""
+    
+    def test_redirected_stdout_gets_plain_text(self, monkeypatch):
+        """Test that a console built for a terminal is not reused after redirection."""
+        monkeypatch.setenv("TERM", "xterm-256color")
+        monkeypatch.delenv("NO_COLOR", raising=False)
+        monkeypatch.delenv("FORCE_COLOR", raising=False)
+        terminal = _TerminalStream()
+        monkeypatch.setattr(sys, "stdout", terminal)
+        utils.format_success("done")
+        assert "\x1b[" in terminal.getvalue()
+        
+        redirected = io.StringIO()
+        monkeypatch.setattr(sys, "stdout", redirected)
+        utils.format_success("done")
+        utils.format_token_count(1234, "gpt-4", "openai")
+        
+        assert redirected.getvalue() == "✓ done\nopenai/gpt-4: 1,234 tokens\n"
+    
+    def test_no_highlighting_off_terminal(self, monkeypatch):
+        """Test that forced colour off a terminal keeps only the explicit markup."""
+        monkeypatch.setenv("FORCE_COLOR", "1")
+        redirected = io.StringIO()
+        monkeypatch.setattr(sys, "stdout", redirected)
+        
+        utils.format_token_count(1234, "gpt-4", "openai")
+        
+        # One bold-green span for the count; no per-digit repr highlighting
+        assert "\x1b[1;32m1,234\x1b[0m" in redirected.getvalue()
+
+
+class TestConfirmCost:
+    """Tests for confirm_cost."""
+    
+    @pytest.fixture
+    def console(self, monkeypatch):
+        """Replace the shared Rich console so rendering can be observed."""
+        console = MagicMock()
+        monkeypatch.setattr(utils, "_get_console", lambda: console)
+        return console
+    
+    def _stdin(self, monkeypatch, isatty):
+        """Install a stdin whose isatty() returns (or raises) as given."""
+        stdin = MagicMock()
+        stdin.isatty.side_effect = isatty
+        monkeypatch.setattr(utils.sys, "stdin", stdin)
+        return stdin
+    
+    def test_below_threshold_skips_stdin(self, console, monkeypatch):
+        """Test that a cheap call is approved without looking at stdin."""
+        stdin = self._stdin(monkeypatch, AssertionError("stdin checked"))
+        
+        assert confirm_cost(_estimate(0.01), threshold=0.10) is True
+        stdin.isatty.assert_not_called()
+        assert console.method_calls == []
+    
+    def test_above_threshold_without_tty_declines(self, console, monkeypatch):
+        """Test that an expensive call is declined silently when nobody can confirm."""
+        self._stdin(monkeypatch, lambda: False)
+        
+        assert confirm_cost(_estimate(0.50), threshold=0.10) is False
+        assert console.method_calls == []
+    
+    def test_above_threshold_with_tty_asks(self, console, monkeypatch):
+        """Test that an expensive call is confirmed interactively on a terminal."""
+        self._stdin(monkeypatch, lambda: True)
+        console.input.return_value = "y"
+        
+        assert confirm_cost(_estimate(0.50), threshold=0.10) is True
+        console.print.assert_called_once()
+        console.input.assert_called_once()
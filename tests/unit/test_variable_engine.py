@@ -161,3 +161,47 @@ Bob"""
         # Should still be valid, extra variables are ignored
         assert is_valid is True
         assert missing == []
+    
+    def test_validate_variables_against_known_list(self, engine, monkeypatch):
+        """Test validation against a pre-extracted variable list skips parsing."""
+        monkeypatch.setattr(engine, "_parse_cached", lambda s: pytest.fail("parsed"))
+        
+        assert engine.validate_variables_against(["count", "name"], {"name": "Alice"}) == (False, ["count"])
+        assert engine.validate_variables_against(["name"], {"name": "Alice"}) == (True, [])
+        assert engine.validate_variables_against([], {}) == (True, [])
+    
+    def test_render_without_delimiters_skips_jinja(self, engine, monkeypatch):
+        """Test that plain text renders like Jinja without compiling."""
+        monkeypatch.setattr(engine, "_compile_cached", lambda s: pytest.fail("compiled"))
+        
+        assert engine.render("Plain text", {}) == "Plain text"
+        assert engine.render("Plain text\n", {"unused": 1}) == "Plain text"
+        assert engine.render("Two lines\n\n", {}) == "Two lines\n"
+        assert engine.render("", {}) == ""
+    
+    def test_prepare_returns_variables_and_template(self, engine):
+        """Test that prepare returns the variable list and a usable template."""
+        variables, template = engine.prepare("Hello {{name}}, you have {{count}} messages")
+        
+        assert variables == ["count", "name"]
+        assert template.render(name="Alice", count=3) == "Hello Alice, you have 3 messages"
+        assert engine.prepare("Hello {{name}}")[1] is engine.prepare("Hello {{name}}")[1]
+    
+    def test_parse_and_compile_are_cached(self, engine):
+        """Test that repeated calls reuse the parsed and compiled template."""
+        template = "Hello {{name}}!"
+        
+        engine.validate_variables(template, {"name": "Alice"})
+        engine.extract_variables(template)
+        assert engine._parse_cached.cache_info().misses == 1
+        
+        assert engine.render(template, {"name": "Alice"}) == "Hello Alice!"
+        assert engine.render(template, {"name": "Bob"}) == "Hello Bob!"
+        assert engine._compile_cached.cache_info().misses == 1
+    
+    def test_extract_variables_returns_fresh_list(self, engine):
+        """Test that mutating a result does not affect cached results."""
+        template = "Hello {{name}}!"
+        engine.extract_variables(template).append("mutated")
+        
+        assert engine.extract_variables(template) == ["name"]